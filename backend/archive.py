@@ -0,0 +1,138 @@
+"""
+Archival of closed tickets out of maintenance_requests.
+
+REPAIRED and SCRAP tickets whose last change is older than TICKET_ARCHIVE_AFTER_DAYS
+are moved in batches into maintenance_requests_archive, which is range-partitioned by
+created_at with one partition per year. maintenance_requests and the indexes serving
+the ticket lists then hold open work and recently closed tickets only, however much
+history builds up. Reads include the archive only when asked (include_archived=true).
+
+Archived tickets are read-only and keep counting in ticket_stats. As with the
+preventive scheduler, every replica may run the archiver: batches are claimed
+with FOR UPDATE SKIP LOCKED, so replicas move disjoint sets of tickets.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Subquery, delete, insert, select, text, union_all
+
+from auth.dbs import async_session_maker
+from models import CLOSED_TICKET, MaintenanceRequest, ticket_archive
+
+logger = logging.getLogger(__name__)
+
+TICKET_ARCHIVE_ENABLED = os.getenv("TICKET_ARCHIVE_ENABLED", "false").lower() == "true"
+TICKET_ARCHIVE_AFTER_DAYS = int(os.getenv("TICKET_ARCHIVE_AFTER_DAYS", "180"))
+TICKET_ARCHIVE_BATCH_SIZE = int(os.getenv("TICKET_ARCHIVE_BATCH_SIZE", "1000"))
+TICKET_ARCHIVE_INTERVAL_SECONDS = float(os.getenv("TICKET_ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+ARCHIVE_COLUMNS = [column.name for column in ticket_archive.columns]
+
+# Yearly partitions this process has already created (or found)
+_partitions: set[int] = set()
+
+
+def all_tickets(*names: str) -> Subquery:
+    """Live and archived tickets as one subquery of the named columns."""
+    return union_all(
+        select(*(MaintenanceRequest.__table__.c[name] for name in names)),
+        select(*(ticket_archive.c[name] for name in names)),
+    ).subquery("all_tickets")
+
+
+def partition_name(year: int) -> str:
+    return f"{ticket_archive.name}_{year}"
+
+
+async def ensure_partitions(years: set[int]) -> None:
+    """Create the archive partitions for `years`, each in its own short transaction."""
+    for year in sorted(years - _partitions):
+        async with async_session_maker() as session:
+            await session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(year)} PARTITION OF {ticket_archive.name} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            ))
+            await session.commit()
+        _partitions.add(year)
+
+
+def closed_tickets_query(cutoff: datetime, limit: int):
+    """Claim up to `limit` closed tickets last changed before `cutoff` (idx_requests_closed_updated)."""
+    return (
+        select(MaintenanceRequest.id, MaintenanceRequest.created_at)
+        .where(text(CLOSED_TICKET))
+        .where(MaintenanceRequest.updated_at < cutoff)
+        .order_by(MaintenanceRequest.updated_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+async def archive_batch(cutoff: datetime) -> int:
+    """Move one batch into the archive with a single DELETE ... RETURNING / INSERT statement."""
+    async with async_session_maker() as session:
+        claimed = (await session.execute(closed_tickets_query(cutoff, TICKET_ARCHIVE_BATCH_SIZE))).all()
+        if not claimed:
+            return 0
+        await ensure_partitions({row.created_at.year for row in claimed})
+
+        tickets = MaintenanceRequest.__table__
+        moved = (
+            delete(tickets)
+            .where(tickets.c.id.in_([row.id for row in claimed]))
+            .returning(*(tickets.c[name] for name in ARCHIVE_COLUMNS))
+            .cte("moved")
+        )
+        await session.execute(
+            insert(ticket_archive).from_select(ARCHIVE_COLUMNS, select(moved)).add_cte(moved)
+        )
+        await session.commit()
+        return len(claimed)
+
+
+async def archive_closed_tickets(after_days: Optional[int] = None) -> int:
+    """Archive every eligible ticket batch by batch; returns how many were moved."""
+    days = TICKET_ARCHIVE_AFTER_DAYS if after_days is None else after_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    total = 0
+    while True:
+        moved = await archive_batch(cutoff)
+        total += moved
+        # A short batch means nothing is left, or the rest is claimed by other replicas
+        if moved < TICKET_ARCHIVE_BATCH_SIZE:
+            return total
+
+
+class TicketArchiver:
+    """Runs archive_closed_tickets every TICKET_ARCHIVE_INTERVAL_SECONDS in the background."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if TICKET_ARCHIVE_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                moved = await archive_closed_tickets()
+                if moved:
+                    logger.info("Archived %d closed tickets", moved)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ticket archival failed")
+            await asyncio.sleep(TICKET_ARCHIVE_INTERVAL_SECONDS)
+
+
+ticket_archiver = TicketArchiver()
@@ -2,6 +2,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, Depends, FastAPI
 
+from archive import ticket_archiver
 from auth.dbs import User, create_db_and_tables
 from auth.schema import UserCreate, UserRead, UserUpdate
 from auth.users import (
@@ -10,13 +11,30 @@ from auth.users import (
     current_admin,
     fastapi_users,
 )
+from jobs import job_runner
+from preventive import preventive_scheduler
+from team_cache import team_cache
+from technician_load import technician_load
+from ticket_feed import ticket_feed
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Not needed if you setup a migration system like Alembic
     await create_db_and_tables()
+    await team_cache.start()
+    await technician_load.start()
+    preventive_scheduler.start()
+    job_runner.start()
+    ticket_archiver.start()
     yield
+    # Drain running jobs first, while the caches they may use are still up
+    await job_runner.stop()
+    await ticket_archiver.stop()
+    await preventive_scheduler.stop()
+    await technician_load.stop()
+    await team_cache.stop()
+    await ticket_feed.stop()
 
 
 router = APIRouter()
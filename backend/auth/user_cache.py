@@ -0,0 +1,75 @@
+"""In-process cache of authenticated users, keyed by user id."""
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from auth.dbs import User
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+
+_USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+def user_from_values(values: dict[str, Any]) -> User:
+    """
+    Build a detached User from column values without touching the database.
+
+    Every call returns a new instance, so a request may attach it to its own
+    session (e.g. PATCH /users/me) without sharing state with other requests.
+    Columns missing from `values` are left expired.
+    """
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+class UserCache:
+    """
+    TTL + LRU cache of user rows.
+
+    Entries are dropped through invalidate() when a user changes on this process;
+    the TTL bounds how long a change made on another replica can go unnoticed.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[uuid.UUID, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, user_id: uuid.UUID) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return user_from_values(values)
+
+    def set(self, user: User) -> None:
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+
+        values = {key: getattr(user, key) for key in _USER_COLUMNS}
+        self._entries[user.id] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE)
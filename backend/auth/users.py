@@ -1,35 +1,132 @@
+import os
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
+import jwt
 from fastapi import Depends, HTTPException, Request, status
-from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, models
+from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, exceptions, models
 from fastapi_users.authentication import (
     AuthenticationBackend,
     CookieTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 
-from auth.dbs import Role, User, get_user_db
+from auth.dbs import Role, User, async_session_maker, get_user_db
+from auth.user_cache import user_cache, user_from_values
+from jobs import enqueue_job, job_handler
 
 SECRET = "SECRET"
 
+# Resolve role / is_active from the signed token instead of the users table.
+# Changes to a user then only take effect once their token is reissued.
+AUTH_TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+TOKEN_CLAIMS = ("email", "role", "is_active", "is_superuser", "is_verified")
+
+
+# ============ Background jobs ============
+# The user manager hooks only enqueue these; the job runner does the work.
+# Payloads carry the user id only: tokens are issued when the job runs, so
+# none is ever stored in the jobs table.
+
+@asynccontextmanager
+async def job_user_manager() -> AsyncIterator["UserManager"]:
+    """A UserManager on its own session, for job handlers."""
+    async with async_session_maker() as session:
+        yield UserManager(SQLAlchemyUserDatabase(session, User))
+
+
+@job_handler("user_registered")
+async def announce_registration(payload: dict) -> None:
+    print(f"User {payload['user_id']} has registered.")
+
+
+@job_handler("password_reset_requested")
+async def send_reset_password_token(payload: dict) -> None:
+    async with job_user_manager() as manager:
+        user = await manager.user_db.get(uuid.UUID(payload["user_id"]))
+        # Deleted or deactivated since the request: forgot_password would refuse it now
+        if user is None or not user.is_active:
+            return
+        token = manager.reset_password_token(user)
+    print(f"User {user.id} has forgot their password. Reset token: {token}")
+
+
+@job_handler("verification_requested")
+async def send_verification_token(payload: dict) -> None:
+    async with job_user_manager() as manager:
+        user = await manager.user_db.get(uuid.UUID(payload["user_id"]))
+        if user is None or not user.is_active or user.is_verified:
+            return
+        token = manager.verification_token(user)
+    print(f"Verification requested for user {user.id}. Verification token: {token}")
+
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     reset_password_token_secret = SECRET
     verification_token_secret = SECRET
 
+    def reset_password_token(self, user: User) -> str:
+        """A reset password token with the claims forgot_password signs."""
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": self.password_helper.hash(user.hashed_password),
+            "aud": self.reset_password_token_audience,
+        }
+        return generate_jwt(
+            token_data, self.reset_password_token_secret, self.reset_password_token_lifetime_seconds
+        )
+
+    def verification_token(self, user: User) -> str:
+        """A verification token with the claims request_verify signs."""
+        token_data = {
+            "sub": str(user.id),
+            "email": user.email,
+            "aud": self.verification_token_audience,
+        }
+        return generate_jwt(
+            token_data, self.verification_token_secret, self.verification_token_lifetime_seconds
+        )
+
+    async def enqueue(self, kind: str, payload: dict) -> None:
+        """
+        Commit a background job through the request's own session. The hooks run
+        after fastapi-users has committed the user change, so the job gets its own commit.
+        """
+        enqueue_job(self.user_db.session, kind, payload)
+        await self.user_db.session.commit()
+
     async def on_after_register(self, user: User, request: Request | None = None):
-        print(f"User {user.id} has registered.")
+        await self.enqueue("user_registered", {"user_id": str(user.id)})
 
     async def on_after_forgot_password(
         self, user: User, token: str, request: Request | None = None
     ):
-        print(f"User {user.id} has forgot their password. Reset token: {token}")
+        # The job issues its own token; this one is never stored
+        await self.enqueue("password_reset_requested", {"user_id": str(user.id)})
 
     async def on_after_request_verify(
         self, user: User, token: str, request: Request | None = None
     ):
-        print(f"Verification requested for user {user.id}. Verification token: {token}")
+        await self.enqueue("verification_requested", {"user_id": str(user.id)})
+
+    async def on_after_update(
+        self, user: User, update_dict: dict[str, Any], request: Request | None = None
+    ):
+        user_cache.invalidate(user.id)
+
+    async def on_after_verify(self, user: User, request: Request | None = None):
+        user_cache.invalidate(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Request | None = None):
+        user_cache.invalidate(user.id)
+
+    async def on_after_delete(self, user: User, request: Request | None = None):
+        user_cache.invalidate(user.id)
 
 
 async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):  # noqa: B008
@@ -50,14 +147,77 @@ cookie_transport = CookieTransport(
 )
 
 
+class CachedJWTStrategy(JWTStrategy[User, uuid.UUID]):
+    """
+    JWT strategy that resolves the token's user without a users-table query when it can.
+
+    Users are served from the in-process user_cache and only loaded through the
+    user manager on a miss. With trust_claims, the user is rebuilt from the
+    claims signed into the token and the database is never consulted.
+    """
+
+    def __init__(self, *args, trust_claims: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.trust_claims = trust_claims
+
+    async def read_token(
+        self, token: str | None, user_manager: BaseUserManager[User, uuid.UUID]
+    ) -> User | None:
+        if token is None:
+            return None
+
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+            user_id = data.get("sub")
+            if user_id is None:
+                return None
+            parsed_id = user_manager.parse_id(user_id)
+        except (jwt.PyJWTError, exceptions.InvalidID):
+            return None
+
+        if self.trust_claims and all(claim in data for claim in TOKEN_CLAIMS):
+            values = {claim: data[claim] for claim in TOKEN_CLAIMS}
+            values.update(id=parsed_id, role=Role(data["role"]))
+            return user_from_values(values)
+
+        user = user_cache.get(parsed_id)
+        if user is not None:
+            return user
+
+        try:
+            user = await user_manager.get(parsed_id)
+        except exceptions.UserNotExists:
+            return None
+        user_cache.set(user)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "email": user.email,
+            "role": user.role.value,
+            "is_active": user.is_active,
+            "is_superuser": user.is_superuser,
+            "is_verified": user.is_verified,
+        }
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+
 def get_jwt_strategy() -> JWTStrategy[models.UP, models.ID]:
     """
     Create a JWT strategy configured with the module SECRET and a 3600-second token lifetime.
 
     Returns:
-        JWTStrategy[models.UP, models.ID]: JWT strategy instance that signs tokens with SECRET and sets tokens to expire after 3600 seconds.
+        JWTStrategy[models.UP, models.ID]: Cached JWT strategy instance that signs tokens with SECRET and sets tokens to expire after 3600 seconds.
     """
-    return JWTStrategy(secret=SECRET, lifetime_seconds=3600)
+    return CachedJWTStrategy(
+        secret=SECRET, lifetime_seconds=3600, trust_claims=AUTH_TRUST_TOKEN_CLAIMS
+    )
 
 
 auth_backend = AuthenticationBackend(
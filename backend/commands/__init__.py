@@ -0,0 +1 @@
+"""Operational commands for GearGuard, run with `uv run python -m commands.<name>`."""
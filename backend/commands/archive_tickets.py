@@ -0,0 +1,31 @@
+"""
+Move closed tickets older than the archive age into maintenance_requests_archive.
+
+The same archival runs in the background when TICKET_ARCHIVE_ENABLED=true; this
+command is for a first bulk run or one-off use.
+
+Usage:
+    uv run python -m commands.archive_tickets              # TICKET_ARCHIVE_AFTER_DAYS (default 180)
+    uv run python -m commands.archive_tickets --days 365
+"""
+import argparse
+import asyncio
+
+from archive import TICKET_ARCHIVE_AFTER_DAYS, archive_closed_tickets
+from auth.dbs import engine
+
+
+async def run(days: int) -> None:
+    moved = await archive_closed_tickets(days)
+    print(f"archived {moved} closed ticket(s) last changed more than {days} days ago")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--days", type=int, default=TICKET_ARCHIVE_AFTER_DAYS,
+        help=f"archive tickets closed and unchanged for this many days (default {TICKET_ARCHIVE_AFTER_DAYS})",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.days))
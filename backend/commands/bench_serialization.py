@@ -0,0 +1,161 @@
+"""
+Micro-benchmark of list response serialization, without a database.
+
+Compares, for the same page of synthetic rows:
+- default: ORM entities through the route's response_model field and
+  JSONResponse, as FastAPI serializes a returned list;
+- fast: RowMappings through the route's ListEncoder (TypeAdapter + orjson).
+
+Only the serialization step is timed; loading RowMappings instead of ORM
+entities saves identity-map work on top of this.
+
+Usage:
+    uv run python -m commands.bench_serialization
+    uv run python -m commands.bench_serialization --rows 1000 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from models import (
+    Equipment,
+    EquipmentUsedByType,
+    MaintenanceRequest,
+    MaintenanceRequestStatus,
+    MaintenanceRequestType,
+)
+from routes.equipment import EQUIPMENT_LIST
+from routes.equipment import router as equipment_router
+from routes.tickets import TICKET_LIST
+from routes.tickets import router as tickets_router
+from serialization import ListEncoder
+
+
+def ticket_row(rng: random.Random, now: datetime) -> dict:
+    created_at = now - timedelta(minutes=rng.randrange(525600))
+    return {
+        "id": uuid.UUID(int=rng.getrandbits(128)),
+        "subject": f"Hydraulic leak on press {rng.randrange(1000)}",
+        "description": "Oil pooling under the main cylinder; pressure drops after warm-up.",
+        "equipment_id": uuid.UUID(int=rng.getrandbits(128)),
+        "maintenance_team_id": uuid.UUID(int=rng.getrandbits(128)),
+        "assigned_user_id": uuid.UUID(int=rng.getrandbits(128)),
+        "request_type": rng.choice(list(MaintenanceRequestType)),
+        "status": rng.choice(list(MaintenanceRequestStatus)),
+        "priority": rng.randrange(4),
+        "scheduled_date": created_at + timedelta(days=2),
+        "completed_at": None,
+        "duration_hours": Decimal("1.50"),
+        "company": "GearGuard",
+        "created_by": uuid.UUID(int=rng.getrandbits(128)),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def equipment_row(rng: random.Random, now: datetime) -> dict:
+    created_at = now - timedelta(minutes=rng.randrange(525600))
+    return {
+        "id": uuid.UUID(int=rng.getrandbits(128)),
+        "name": f"Press {rng.randrange(1000)}",
+        "category": "Machinery",
+        "company": "GearGuard",
+        "description": None,
+        "used_by_type": EquipmentUsedByType.EMPLOYEE,
+        "used_by_user_id": uuid.UUID(int=rng.getrandbits(128)),
+        "used_in_location": "Hall B",
+        "work_center": "Stamping",
+        "maintenance_team_id": uuid.UUID(int=rng.getrandbits(128)),
+        "default_technician_id": uuid.UUID(int=rng.getrandbits(128)),
+        "assigned_date": created_at.date(),
+        "scrap_date": None,
+        "is_scrapped": False,
+        "next_preventive_date": None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def list_route(router, path: str) -> APIRoute:
+    return next(
+        route for route in router.routes
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods
+    )
+
+
+def per_call_us(func, repeat: int) -> float:
+    func()  # warm up
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1_000_000
+
+
+def bench(label: str, route: APIRoute, encoder: ListEncoder, entity, rows: list[dict], repeat: int) -> None:
+    entities = [entity(**row) for row in rows]
+    mappings = IteratorResult(
+        SimpleResultMetaData(encoder.fields), iter([tuple(row[name] for name in encoder.fields) for row in rows])
+    ).mappings().all()
+    loop = asyncio.new_event_loop()
+
+    def default_path() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=route.response_field, response_content=entities)
+        )
+        return JSONResponse(content).body
+
+    def fast_path() -> bytes:
+        return encoder.encode(mappings)
+
+    assert json.loads(default_path()) == json.loads(fast_path()), f"{label}: outputs differ"
+    default_us = per_call_us(default_path, repeat)
+    fast_us = per_call_us(fast_path, repeat)
+    loop.close()
+    print(
+        f"{label:<28} default {default_us:9.1f} us   fast {fast_us:9.1f} us   "
+        f"speedup {default_us / fast_us:5.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per page (default 100)")
+    parser.add_argument("--repeat", type=int, default=500, help="calls per timing round (default 500)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime(2026, 1, 1)
+    print(f"{args.rows} rows per page, best of 5 rounds of {args.repeat} calls")
+    bench(
+        "GET /tickets/",
+        list_route(tickets_router, "/tickets/"),
+        TICKET_LIST,
+        MaintenanceRequest,
+        [ticket_row(rng, now) for _ in range(args.rows)],
+        args.repeat,
+    )
+    bench(
+        "GET /equipment/",
+        list_route(equipment_router, "/equipment/"),
+        EQUIPMENT_LIST,
+        Equipment,
+        [equipment_row(rng, now) for _ in range(args.rows)],
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
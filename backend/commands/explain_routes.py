@@ -0,0 +1,202 @@
+"""
+Fail if any list route's query falls back to a sequential scan of a large table.
+
+Runs EXPLAIN on the query each list route issues (first page and cursor page)
+with the default planner settings, against a database filled by commands.seed,
+so the plans are the ones the planner picks at realistic sizes and skew. Sample
+filter values are the busiest team, requester and equipment owner in the data.
+Sequential scans of relations under SEQ_SCAN_MIN_ROWS (teams, memberships) are
+cheaper than an index and are not reported.
+
+Usage:
+    uv run python -m commands.seed
+    uv run python -m commands.explain_routes
+"""
+import asyncio
+import json
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import Select, func, select, text
+
+from archive import TICKET_ARCHIVE_AFTER_DAYS, closed_tickets_query
+from auth.dbs import engine
+from commands.seed import END_DATE
+from models import (
+    Equipment,
+    MaintenanceRequest,
+    MaintenanceRequestStatus,
+    MaintenanceTeamMember,
+)
+from pagination import encode_cursor, paginate, paginate_ranked
+from preventive import due_equipment_query
+from routes.equipment import EQUIPMENT_LIST, equipment_search
+from routes.tickets import (
+    TICKET_LIST,
+    calendar_buckets,
+    calendar_query,
+    filter_tickets,
+    ticket_page,
+    ticket_search,
+)
+
+# Fewer seeded tickets than this and the plans say nothing about production
+MIN_SEEDED_TICKETS = 100_000
+SEQ_SCAN_MIN_ROWS = 10_000
+
+# A cursor a month back from the end of the seeded history
+SAMPLE_CURSOR = encode_cursor(END_DATE - timedelta(days=30), uuid.UUID(int=0))
+
+
+@dataclass
+class Sample:
+    """Filter values taken from the seeded data."""
+    team_id: uuid.UUID
+    requester_id: uuid.UUID
+    owner_id: uuid.UUID
+
+
+async def busiest(conn, column) -> uuid.UUID:
+    """The most frequent value of `column`, so each filtered page is its heaviest."""
+    return await conn.scalar(
+        select(column).where(column.is_not(None)).group_by(column).order_by(func.count().desc()).limit(1)
+    )
+
+
+async def sample_values(conn) -> Sample:
+    return Sample(
+        team_id=await busiest(conn, MaintenanceRequest.maintenance_team_id),
+        requester_id=await busiest(conn, MaintenanceRequest.created_by),
+        owner_id=await busiest(conn, Equipment.used_by_user_id),
+    )
+
+
+async def relation_rows(conn) -> dict[str, float]:
+    """Estimated rows per table, from the statistics ANALYZE left behind (-1 if never analyzed)."""
+    result = await conn.execute(text("SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p')"))
+    return dict(result.all())
+
+
+def route_queries(sample: Sample) -> dict[str, Select]:
+    """The queries issued by each list route, keyed by a readable label."""
+    tickets = select(*TICKET_LIST.columns(MaintenanceRequest))
+    equipment = select(*EQUIPMENT_LIST.columns(Equipment))
+    queries = {
+        "GET /tickets/": tickets,
+        "GET /tickets/?status_filter=": tickets.where(
+            MaintenanceRequest.status == MaintenanceRequestStatus.NEW
+        ),
+        "GET /tickets/?team_id=": tickets.where(
+            MaintenanceRequest.maintenance_team_id == sample.team_id
+        ),
+        "GET /tickets/my": tickets.where(
+            MaintenanceRequest.created_by == sample.requester_id
+        ),
+        "GET /equipment/": equipment,
+        "GET /equipment/my/list": equipment
+        .where(Equipment.used_by_user_id == sample.owner_id)
+        .where(Equipment.is_scrapped == False),  # noqa: E712
+    }
+
+    paged = {}
+    for label, query in queries.items():
+        model = MaintenanceRequest if label.startswith("GET /tickets") else Equipment
+        paged[label] = paginate(query, model, 0, 100, None)
+        paged[f"{label} (cursor)"] = paginate(query, model, 0, 100, SAMPLE_CURSOR)
+
+    match, rank = ticket_search("repair request")
+    search = select(MaintenanceRequest, rank).where(match)
+    paged["GET /tickets/search"] = paginate_ranked(search, MaintenanceRequest, rank, 20, None)
+    paged["GET /tickets/search (users)"] = paginate_ranked(
+        search.where(MaintenanceRequest.created_by == sample.requester_id), MaintenanceRequest, rank, 20, None
+    )
+    
+    match, similarity = equipment_search("equipment 12")
+    paged["GET /equipment/search"] = (
+        select(Equipment.id, similarity).where(match).order_by(similarity.desc()).limit(10)
+    )
+    
+    paged["GET /teams/{team_id}/members"] = select(MaintenanceTeamMember).where(
+        MaintenanceTeamMember.team_id == sample.team_id
+    )
+    # The six-week month view ending with the seeded history
+    calendar = calendar_query(END_DATE.date() - timedelta(days=41), END_DATE.date())
+    paged["GET /tickets/calendar"] = calendar_buckets(calendar, 20)
+    paged["GET /tickets/calendar?team_id="] = calendar_buckets(
+        calendar.where(MaintenanceRequest.maintenance_team_id == sample.team_id), 20
+    )
+    paged["preventive scheduler (due equipment)"] = due_equipment_query(END_DATE.date(), 1000)
+    paged["archiver (closed tickets)"] = closed_tickets_query(
+        END_DATE - timedelta(days=TICKET_ARCHIVE_AFTER_DAYS), 1000
+    )
+    
+    def archived(source):
+        return select(*TICKET_LIST.columns(source))
+    
+    def archived_team(source):
+        return filter_tickets(select(*TICKET_LIST.columns(source)), None, None, sample.team_id, source)
+    
+    def archived_mine(source):
+        return select(*TICKET_LIST.columns(source)).where(source.created_by == sample.requester_id)
+    
+    for label, build in [
+        ("GET /tickets/?include_archived=true", archived),
+        ("GET /tickets/?include_archived=true&team_id=", archived_team),
+        ("GET /tickets/my?include_archived=true", archived_mine),
+    ]:
+        paged[label] = ticket_page(build, True, 0, 100, None)
+        paged[f"{label} (cursor)"] = ticket_page(build, True, 0, 100, SAMPLE_CURSOR)
+    return paged
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    """Return the relations scanned sequentially anywhere in an EXPLAIN JSON plan."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def explain_routes(conn) -> list[str]:
+    rows = await relation_rows(conn)
+    tickets = rows.get(MaintenanceRequest.__tablename__, -1)
+    if tickets < MIN_SEEDED_TICKETS:
+        message = (
+            f"{MaintenanceRequest.__tablename__} holds about {max(tickets, 0):,.0f} analyzed rows; "
+            f"seed at least {MIN_SEEDED_TICKETS:,} with: uv run python -m commands.seed"
+        )
+        print(message)
+        return [message]
+
+    failures = []
+    sample = await sample_values(conn)
+    for label, query in route_queries(sample).items():
+        sql = query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        raw = result.scalar_one()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        seq_scans = [
+            relation for relation in find_seq_scans(plan)
+            if rows.get(relation, 0) >= SEQ_SCAN_MIN_ROWS
+        ]
+        if seq_scans:
+            failures.append(f"{label}: sequential scan on {', '.join(seq_scans)}")
+            print(f"FAIL {label}: sequential scan on {', '.join(seq_scans)}")
+        else:
+            print(f"ok   {label}")
+    return failures
+
+
+async def check() -> list[str]:
+    async with engine.connect() as conn:
+        failures = await explain_routes(conn)
+    await engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check()) else 0)
@@ -0,0 +1,87 @@
+"""
+Recompute the ticket_stats rollup from live and archived tickets and report drift.
+
+Usage:
+    uv run python -m commands.rebuild_ticket_stats          # report drift, then rebuild
+    uv run python -m commands.rebuild_ticket_stats --check  # report drift only, exit 1 if any
+"""
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from archive import all_tickets
+from auth.dbs import engine
+from models import Equipment, TicketStat
+
+STAT_COLUMNS = ["maintenance_team_id", "equipment_category", "status", "day", "ticket_count"]
+
+
+def expected_stats_query():
+    """The rollup as it should be, grouped straight from the tickets (archived ones included)."""
+    tickets = all_tickets("maintenance_team_id", "equipment_id", "status", "created_at")
+    day = func.date(tickets.c.created_at)
+    return (
+        select(
+            tickets.c.maintenance_team_id,
+            Equipment.category,
+            tickets.c.status,
+            day,
+            func.count(),
+        )
+        .select_from(tickets)
+        .join(Equipment, Equipment.id == tickets.c.equipment_id)
+        .group_by(tickets.c.maintenance_team_id, Equipment.category, tickets.c.status, day)
+    )
+
+
+async def stats_drift(conn: AsyncConnection) -> tuple[list, int]:
+    """The (key, stored, actual) groups where ticket_stats is off, and the number of groups."""
+    expected = {row[:4]: row[4] for row in (await conn.execute(expected_stats_query())).all()}
+    actual = {
+        row[:4]: row[4]
+        for row in (await conn.execute(
+            select(
+                TicketStat.maintenance_team_id,
+                TicketStat.equipment_category,
+                TicketStat.status,
+                TicketStat.day,
+                TicketStat.ticket_count,
+            ).where(TicketStat.ticket_count != 0)
+        )).all()
+    }
+    drift = sorted(
+        (key, actual.get(key, 0), expected.get(key, 0))
+        for key in expected.keys() | actual.keys()
+        if actual.get(key, 0) != expected.get(key, 0)
+    )
+    return drift, len(expected)
+
+
+async def rebuild(check_only: bool) -> int:
+    async with engine.begin() as conn:
+        # Block ticket writes so the rollup and the tickets are read from the same state
+        await conn.execute(text("LOCK TABLE maintenance_requests, maintenance_requests_archive IN SHARE MODE"))
+        
+        drift, groups = await stats_drift(conn)
+        for (team_id, category, ticket_status, day), have, want in drift:
+            print(f"drift {team_id} {category} {ticket_status.value} {day}: stored {have}, actual {want}")
+        print(f"{len(drift)} drifted group(s) out of {groups}")
+        
+        if not check_only:
+            await conn.execute(delete(TicketStat))
+            await conn.execute(insert(TicketStat).from_select(STAT_COLUMNS, expected_stats_query()))
+            print("ticket_stats rebuilt")
+    
+    await engine.dispose()
+    return len(drift)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--check", action="store_true", help="only report drift")
+    args = parser.parse_args()
+    drifted = asyncio.run(rebuild(args.check))
+    sys.exit(1 if args.check and drifted else 0)
@@ -0,0 +1,435 @@
+"""
+Generate a large, deterministic synthetic dataset and load it with binary COPY.
+
+Users, teams, memberships and equipment are generated in this process. Tickets
+are generated in fixed-size chunks by a pool of worker processes, each COPYing
+its chunk over its own connection (or in this process with --workers 1). Every
+chunk has its own RNG derived from --seed, so the data is identical for a given
+seed whatever --workers is. The performance suite seeds its database with the
+same generator (tests/conftest.py).
+
+Skew:
+  * hot equipment: tickets pick equipment from a Zipf(--hot-skew) distribution
+  * seasonal preventive work: preventive tickets cluster in spring and autumn
+  * status mix: NEW -> IN_PROGRESS -> REPAIRED | SCRAP by ticket age; only
+    scrapped equipment has SCRAP tickets, and never after its scrap date
+
+All users can log in with SEED_PASSWORD.
+
+Usage:
+    uv run python -m commands.seed                                  # 1M tickets
+    uv run python -m commands.seed --tickets 10000000 --workers 8
+    uv run python -m commands.seed --truncate --seed 7              # replace existing data
+"""
+import argparse
+import asyncio
+import itertools
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import asyncpg
+from fastapi_users.password import PasswordHelper
+from sqlalchemy import delete, func, insert, make_url, select, text
+from sqlalchemy.schema import CreateIndex
+
+from auth.dbs import DATABASE_DIRECT_URL, Role, User, create_db_and_tables, engine
+from commands.rebuild_ticket_stats import STAT_COLUMNS, expected_stats_query
+from models import (
+    Equipment,
+    Job,
+    MaintenanceRequest,
+    MaintenanceRequestStatus,
+    MaintenanceRequestType,
+    MaintenanceTeam,
+    MaintenanceTeamMember,
+    PreventiveSchedule,
+    TicketStat,
+    ticket_archive,
+)
+
+SEED_PASSWORD = "password"
+END_DATE = datetime(2026, 1, 1)
+
+CATEGORIES = ["Computers", "Printers", "Vehicles", "HVAC", "Machinery", "Furniture", "Electrical"]
+CATEGORY_WEIGHTS = [30, 15, 10, 10, 20, 5, 10]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries"]
+LOCATIONS = ["Plant A", "Plant B", "Warehouse", "Head Office", "Lab"]
+PRIORITY_WEIGHTS = [50, 30, 15, 5]
+# Relative preventive workload per month (Jan..Dec): spring and autumn service windows
+SEASONAL_WEIGHTS = [2, 3, 8, 10, 8, 3, 2, 2, 8, 10, 8, 3]
+TECHNICIANS_PER_TEAM = 8
+SCRAPPED_SHARE = 0.03
+
+USER_COLUMNS = ["id", "email", "hashed_password", "is_active", "is_superuser", "is_verified", "role"]
+TEAM_COLUMNS = ["id", "name", "description", "created_at"]
+MEMBER_COLUMNS = ["id", "user_id", "team_id", "role", "created_at"]
+EQUIPMENT_COLUMNS = [
+    "id", "name", "category", "company", "used_by_type", "used_by_user_id", "used_in_location",
+    "maintenance_team_id", "default_technician_id", "assigned_date", "scrap_date", "is_scrapped",
+    "created_at", "updated_at",
+]
+TICKET_COLUMNS = [
+    "id", "subject", "equipment_id", "maintenance_team_id", "assigned_user_id", "request_type",
+    "status", "scheduled_date", "completed_at", "duration_hours", "company", "priority",
+    "created_by", "created_at", "updated_at",
+]
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    dsn: str
+    seed: int
+    tickets: int
+    chunk_size: int
+    days: int
+    hot_skew: float
+    preventive_share: float
+
+
+@dataclass(frozen=True)
+class EquipmentInfo:
+    """What ticket generation needs to know about one equipment row."""
+    id: uuid.UUID
+    team_id: uuid.UUID
+    owner_id: uuid.UUID
+    company: str
+    technicians: tuple[uuid.UUID, ...]
+    scrapped_at: datetime | None
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _asyncpg_dsn() -> str:
+    return make_url(DATABASE_DIRECT_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+# ============ Dimension data ============
+
+def generate_dimensions(args, rng: random.Random):
+    """Users, teams, members and equipment as COPY records, plus ticket-side equipment info."""
+    hashed_password = PasswordHelper().hash(SEED_PASSWORD)
+    start = END_DATE - timedelta(days=args.days)
+
+    admin_count = max(1, args.users // 1000)
+    users = [
+        (_uuid(rng), f"user{i}@seed.example", hashed_password, True, False, True,
+         (Role.ADMIN if i < admin_count else Role.USER).value)
+        for i in range(args.users)
+    ]
+    user_ids = [row[0] for row in users]
+
+    teams = [
+        (_uuid(rng), f"Team {i:04d}", f"Synthetic maintenance team {i}", start - timedelta(days=30))
+        for i in range(args.teams)
+    ]
+
+    # Technicians are spread round-robin over the teams; the first of each team manages it
+    technician_ids = user_ids[admin_count:admin_count + args.teams * TECHNICIANS_PER_TEAM]
+    team_technicians: dict[uuid.UUID, list[uuid.UUID]] = {team[0]: [] for team in teams}
+    members = []
+    for i, user_id in enumerate(technician_ids):
+        team_id = teams[i % args.teams][0]
+        role = "MANAGER" if not team_technicians[team_id] else "TECHNICIAN"
+        team_technicians[team_id].append(user_id)
+        members.append((_uuid(rng), user_id, team_id, role, start - timedelta(days=30)))
+
+    requesters = user_ids[admin_count:]
+    equipment = []
+    equipment_info = []
+    for i in range(args.equipment):
+        team_id = rng.choice(teams)[0]
+        technicians = tuple(team_technicians[team_id]) or (user_ids[0],)
+        owner_id = rng.choice(requesters) if requesters else user_ids[0]
+        company = rng.choice(COMPANIES)
+        created_at = start - timedelta(days=rng.randrange(365))
+        scrapped_at = None
+        if rng.random() < SCRAPPED_SHARE:
+            scrapped_at = start + timedelta(seconds=rng.random() * args.days * 86400)
+        equipment_id = _uuid(rng)
+        equipment.append((
+            equipment_id, f"Equipment {i:06d}", rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0],
+            company, "EMPLOYEE", owner_id, rng.choice(LOCATIONS), team_id, rng.choice(technicians),
+            created_at.date(), scrapped_at.date() if scrapped_at else None, scrapped_at is not None,
+            created_at, scrapped_at or created_at,
+        ))
+        equipment_info.append(
+            EquipmentInfo(equipment_id, team_id, owner_id, company, technicians, scrapped_at)
+        )
+
+    return users, teams, members, equipment, equipment_info, user_ids[:admin_count]
+
+
+# ============ Ticket generation (worker processes) ============
+
+_equipment: list[EquipmentInfo] = []
+_cum_weights: list[float] = []
+_admin_ids: list[uuid.UUID] = []
+_config: SeedConfig
+
+
+def _init_worker(config: SeedConfig, equipment: list[EquipmentInfo], admin_ids: list[uuid.UUID]):
+    global _config, _equipment, _cum_weights, _admin_ids
+    _config = config
+    _equipment = equipment
+    _admin_ids = admin_ids
+    # Zipf popularity: the k-th hottest item gets weight 1 / k^s
+    _cum_weights = list(itertools.accumulate(
+        1 / (rank ** config.hot_skew) for rank in range(1, len(equipment) + 1)
+    ))
+
+
+def _pick_status(rng: random.Random, age_days: float, scrappable: bool) -> MaintenanceRequestStatus:
+    """Where a ticket of this age has got to along NEW -> IN_PROGRESS -> REPAIRED | SCRAP."""
+    roll = rng.random()
+    if scrappable and age_days > 1 and roll < 0.25:
+        return MaintenanceRequestStatus.SCRAP
+    if age_days < 2:
+        return MaintenanceRequestStatus.NEW if roll < 0.6 else MaintenanceRequestStatus.IN_PROGRESS
+    if age_days < 14:
+        if roll < 0.15:
+            return MaintenanceRequestStatus.NEW
+        return MaintenanceRequestStatus.IN_PROGRESS if roll < 0.5 else MaintenanceRequestStatus.REPAIRED
+    if roll < 0.02:
+        return MaintenanceRequestStatus.NEW
+    return MaintenanceRequestStatus.IN_PROGRESS if roll < 0.07 else MaintenanceRequestStatus.REPAIRED
+
+
+def generate_ticket_chunk(chunk: int) -> list[tuple]:
+    """COPY records for tickets [chunk * chunk_size, ...), deterministic in (seed, chunk)."""
+    config = _config
+    rng = random.Random(f"{config.seed}:tickets:{chunk}")
+    first = chunk * config.chunk_size
+    count = min(config.chunk_size, config.tickets - first)
+    span_seconds = config.days * 86400
+    start = END_DATE - timedelta(days=config.days)
+    max_seasonal = max(SEASONAL_WEIGHTS)
+
+    picks = rng.choices(range(len(_equipment)), cum_weights=_cum_weights, k=count)
+    records = []
+    for n, equipment_index in enumerate(picks):
+        item = _equipment[equipment_index]
+        preventive = rng.random() < config.preventive_share
+
+        # Tickets of scrapped equipment all predate the scrap
+        window = span_seconds
+        if item.scrapped_at is not None:
+            window = max((item.scrapped_at - start).total_seconds(), 1)
+        while True:
+            created_at = start + timedelta(seconds=rng.random() * window)
+            if not preventive or rng.random() * max_seasonal < SEASONAL_WEIGHTS[created_at.month - 1]:
+                break
+
+        ticket_status = _pick_status(
+            rng, (END_DATE - created_at).total_seconds() / 86400, item.scrapped_at is not None
+        )
+        assigned_user_id = None
+        if ticket_status != MaintenanceRequestStatus.NEW or rng.random() < 0.5:
+            assigned_user_id = rng.choice(item.technicians)
+
+        completed_at = None
+        duration_hours = None
+        if ticket_status == MaintenanceRequestStatus.REPAIRED:
+            duration = min(rng.lognormvariate(1.0, 0.8), 999)
+            duration_hours = Decimal(f"{duration:.2f}")
+            completed_at = min(created_at + timedelta(hours=duration + rng.random() * 72), END_DATE)
+        elif ticket_status == MaintenanceRequestStatus.SCRAP:
+            completed_at = item.scrapped_at
+
+        scheduled_date = None
+        if preventive:
+            scheduled_date = (created_at + timedelta(days=rng.randrange(1, 31))).replace(
+                hour=8, minute=0, second=0, microsecond=0
+            )
+
+        records.append((
+            _uuid(rng),
+            f"{'Preventive service' if preventive else 'Repair request'} #{first + n}",
+            item.id,
+            item.team_id,
+            assigned_user_id,
+            (MaintenanceRequestType.PREVENTIVE if preventive else MaintenanceRequestType.CORRECTIVE).value,
+            ticket_status.value,
+            scheduled_date,
+            completed_at,
+            duration_hours,
+            item.company,
+            rng.choices(range(4), PRIORITY_WEIGHTS)[0],
+            rng.choice(_admin_ids) if preventive else item.owner_id,
+            created_at,
+            completed_at or created_at,
+        ))
+    return records
+
+
+async def _copy(dsn: str, table: str, columns: list[str], records: list[tuple]) -> None:
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.copy_records_to_table(table, records=records, columns=columns)
+    finally:
+        await connection.close()
+
+
+def load_ticket_chunk(chunk: int) -> int:
+    """Generate one chunk and COPY it over a dedicated connection."""
+    records = generate_ticket_chunk(chunk)
+    asyncio.run(_copy(_config.dsn, MaintenanceRequest.__tablename__, TICKET_COLUMNS, records))
+    return len(records)
+
+
+# ============ Orchestration ============
+
+SEEDED_TABLES = [
+    TicketStat.__tablename__,
+    # Archived tickets count in ticket_stats and the dashboards; its partitions go with it
+    ticket_archive.name,
+    MaintenanceRequest.__tablename__,
+    # References equipment, so TRUNCATE refuses to empty equipment without it
+    PreventiveSchedule.__tablename__,
+    Equipment.__tablename__,
+    MaintenanceTeamMember.__tablename__,
+    MaintenanceTeam.__tablename__,
+    User.__tablename__,
+    # Pending jobs refer to users and tickets of the old data
+    Job.__tablename__,
+]
+
+
+async def prepare(truncate: bool) -> bool:
+    """Create missing tables and make sure they are empty. False if they hold data."""
+    await create_db_and_tables()
+    async with engine.begin() as conn:
+        if truncate:
+            quoted = ", ".join(f'"{table}"' for table in SEEDED_TABLES)
+            await conn.execute(text(f"TRUNCATE {quoted}"))
+            return True
+        for table in SEEDED_TABLES:
+            if (await conn.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{table}")'))).scalar():
+                print(f"{table} is not empty; pass --truncate to replace existing data")
+                return False
+    return True
+
+
+async def load_dimensions(dsn: str, users, teams, members, equipment) -> None:
+    connection = await asyncpg.connect(dsn)
+    try:
+        async with connection.transaction():
+            for table, columns, records in [
+                (User.__tablename__, USER_COLUMNS, users),
+                (MaintenanceTeam.__tablename__, TEAM_COLUMNS, teams),
+                (MaintenanceTeamMember.__tablename__, MEMBER_COLUMNS, members),
+                (Equipment.__tablename__, EQUIPMENT_COLUMNS, equipment),
+            ]:
+                await connection.copy_records_to_table(table, records=records, columns=columns)
+    finally:
+        await connection.close()
+
+
+async def drop_ticket_indexes() -> None:
+    """Indexes are rebuilt once after the load, which is far cheaper than per-row maintenance."""
+    async with engine.begin() as conn:
+        for index in MaintenanceRequest.__table__.indexes:
+            await conn.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+
+
+async def finish() -> None:
+    async with engine.begin() as conn:
+        for index in MaintenanceRequest.__table__.indexes:
+            await conn.execute(CreateIndex(index, if_not_exists=True))
+        await conn.execute(delete(TicketStat))
+        await conn.execute(insert(TicketStat).from_select(STAT_COLUMNS, expected_stats_query()))
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+        counts = (await conn.execute(select(
+            select(func.count()).select_from(User).scalar_subquery(),
+            select(func.count()).select_from(Equipment).scalar_subquery(),
+            select(func.count()).select_from(MaintenanceRequest).scalar_subquery(),
+        ))).one()
+    print(f"database now holds {counts[0]} users, {counts[1]} equipment, {counts[2]} tickets")
+    await engine.dispose()
+
+
+async def load_tickets(config: SeedConfig, chunks: int, workers: int, equipment_info, admin_ids):
+    """Yield the size of each ticket chunk as it is loaded."""
+    if workers <= 1:
+        _init_worker(config, equipment_info, admin_ids)
+        for chunk in range(chunks):
+            records = generate_ticket_chunk(chunk)
+            await _copy(config.dsn, MaintenanceRequest.__tablename__, TICKET_COLUMNS, records)
+            yield len(records)
+        return
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(config, equipment_info, admin_ids),
+    ) as executor:
+        futures = [loop.run_in_executor(executor, load_ticket_chunk, chunk) for chunk in range(chunks)]
+        for future in asyncio.as_completed(futures):
+            yield await future
+
+
+async def seed(args) -> int:
+    if not await prepare(args.truncate):
+        return 1
+
+    started = time.perf_counter()
+    dsn = _asyncpg_dsn()
+    rng = random.Random(args.seed)
+    users, teams, members, equipment, equipment_info, admin_ids = generate_dimensions(args, rng)
+    await load_dimensions(dsn, users, teams, members, equipment)
+    print(f"loaded {len(users)} users, {len(teams)} teams, {len(members)} members, "
+          f"{len(equipment)} equipment in {time.perf_counter() - started:.1f}s")
+
+    await drop_ticket_indexes()
+    config = SeedConfig(
+        dsn=dsn,
+        seed=args.seed,
+        tickets=args.tickets,
+        chunk_size=args.chunk_size,
+        days=args.days,
+        hot_skew=args.hot_skew,
+        preventive_share=args.preventive_share,
+    )
+    chunks = math.ceil(args.tickets / args.chunk_size)
+    loaded = 0
+    async for count in load_tickets(config, chunks, args.workers, equipment_info, admin_ids):
+        loaded += count
+        elapsed = time.perf_counter() - started
+        print(f"tickets {loaded}/{args.tickets} ({loaded / elapsed:,.0f} rows/s)", end="\r")
+    print()
+
+    print("rebuilding indexes and ticket_stats...")
+    await finish()
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--equipment", type=int, default=50_000)
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=730, help="history length ending at END_DATE")
+    parser.add_argument("--hot-skew", type=float, default=1.1, help="Zipf exponent for equipment popularity")
+    parser.add_argument("--preventive-share", type=float, default=0.3)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="tickets per COPY")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--truncate", action="store_true", help="empty the seeded tables first")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(seed(build_parser().parse_args())))
@@ -0,0 +1,90 @@
+"""
+Weak ETags and If-None-Match handling for GearGuard read routes.
+
+Single resources are versioned by (id, updated_at). A list page is versioned
+by its row count, its newest updated_at and a digest of its ids, so rows
+entering or leaving the page change the tag as well as edits. When a client
+revalidates, the page version is read with one aggregate over the same index
+seek as the page itself, and a match is answered with 304 before any row is
+loaded or serialized.
+"""
+import hashlib
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, Text, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Responses depend on the signed-in user; browsers revalidate on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def resource_etag(row_id: uuid.UUID, updated_at: datetime) -> str:
+    return f'W/"{row_id}-{updated_at.isoformat()}"'
+
+
+def page_etag(count: int, newest: Optional[datetime], ids_digest: Optional[str]) -> str:
+    if not count:
+        return 'W/"empty"'
+    return f'W/"{count}-{newest.isoformat()}-{ids_digest}"'
+
+
+def rows_etag(rows: Sequence[Any]) -> str:
+    """The page ETag of already loaded RowMappings; matches page_version_query."""
+    if not rows:
+        return page_etag(0, None, None)
+    ids = ",".join(str(row_id) for row_id in sorted(row["id"] for row in rows))
+    return page_etag(
+        len(rows),
+        max(row["updated_at"] for row in rows),
+        hashlib.md5(ids.encode()).hexdigest(),
+    )
+
+
+def page_version_query(page: Select) -> Select:
+    """(count, max(updated_at), md5 of sorted ids) of the rows a paginated query returns."""
+    columns = page.selected_columns
+    rows = page.with_only_columns(columns.id, columns.updated_at).subquery("page")
+    return select(
+        func.count(),
+        func.max(rows.c.updated_at),
+        func.md5(func.string_agg(cast(rows.c.id, Text), aggregate_order_by(literal_column("','"), rows.c.id))),
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+async def page_not_modified(request: Request, session: AsyncSession, page: Select) -> Optional[Response]:
+    """
+    A 304 response when the client's copy of `page` is still current, else None.
+    Only revalidating requests pay for the aggregate query.
+    """
+    if "if-none-match" not in request.headers:
+        return None
+    etag = page_etag(*(await session.execute(page_version_query(page))).one())
+    return not_modified(etag) if etag_matches(request, etag) else None
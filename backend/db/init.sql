@@ -6,4 +6,8 @@
 \i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/006_maintenance_team_members.sql
 \i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/004_equipment.sql
 \i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/007_maintenance_request.sql
-\i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/008_indexes.sql
\ No newline at end of file
+\i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/008_indexes.sql
+\i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/009_ticket_stats.sql
+\i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/010_preventive_schedules.sql
+\i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/011_jobs.sql
+\i C:/Users/harsh/OneDrive/Desktop/Harsh/oddo_matrix_26/backend/db/schema/012_maintenance_requests_archive.sql
\ No newline at end of file
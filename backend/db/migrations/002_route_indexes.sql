@@ -0,0 +1,20 @@
+-- Migration: Replace single-column indexes with ones matching the route query shapes
+-- Run this in your PostgreSQL database (oddox)
+
+DROP INDEX IF EXISTS idx_requests_status;
+DROP INDEX IF EXISTS idx_requests_team;
+DROP INDEX IF EXISTS idx_equipment_used_by;
+
+CREATE INDEX IF NOT EXISTS idx_requests_created ON maintenance_requests(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_requests_status_created ON maintenance_requests(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_requests_team_created ON maintenance_requests(maintenance_team_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_requests_created_by_created ON maintenance_requests(created_by, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_equipment_created ON equipment(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_equipment_used_by_active ON equipment(used_by_user_id, created_at DESC, id DESC)
+  WHERE is_scrapped = false;
+
+-- Membership uniqueness keyed by team first (replaces UNIQUE (user_id, team_id))
+CREATE UNIQUE INDEX IF NOT EXISTS uq_team_members_team_user ON maintenance_team_members(team_id, user_id);
+ALTER TABLE maintenance_team_members
+DROP CONSTRAINT IF EXISTS maintenance_team_members_user_id_team_id_key;
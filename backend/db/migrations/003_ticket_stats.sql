@@ -0,0 +1,12 @@
+-- Migration: Add the ticket_stats rollup table
+-- Run this in your PostgreSQL database (oddox), then populate it with
+--   uv run python -m commands.rebuild_ticket_stats
+
+CREATE TABLE IF NOT EXISTS ticket_stats (
+  maintenance_team_id UUID NOT NULL,
+  equipment_category TEXT NOT NULL,
+  status maintenance_request_status NOT NULL,
+  day DATE NOT NULL,
+  ticket_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (maintenance_team_id, equipment_category, status, day)
+);
@@ -0,0 +1,13 @@
+-- Migration: Full-text search column and index for GET /tickets/search
+-- Run this in your PostgreSQL database (oddox)
+-- Adding a STORED generated column rewrites maintenance_requests under an
+-- exclusive lock; run it in a maintenance window on large tables.
+
+ALTER TABLE maintenance_requests
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(subject, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+
+-- CONCURRENTLY keeps ticket writes flowing while the index builds (cannot run inside a transaction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_requests_search ON maintenance_requests USING GIN (search_vector);
@@ -0,0 +1,9 @@
+-- Migration: Trigram index for GET /equipment/search
+-- Run this in your PostgreSQL database (oddox)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- CONCURRENTLY keeps equipment writes flowing while the index builds (cannot run inside a transaction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_equipment_search_trgm ON equipment USING GIN (
+  (name || ' ' || category || ' ' || coalesce(used_in_location, '') || ' ' || coalesce(work_center, '')) gin_trgm_ops
+);
@@ -0,0 +1,25 @@
+-- Migration: Preventive maintenance schedules and the scheduler's indexes
+-- Run this in your PostgreSQL database (oddox)
+
+-- Existing equipment starts due today, so the first tick resolves its rule
+ALTER TABLE equipment ADD COLUMN IF NOT EXISTS next_preventive_date DATE DEFAULT CURRENT_DATE;
+
+CREATE TABLE IF NOT EXISTS preventive_schedules (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  equipment_id UUID UNIQUE REFERENCES equipment(id) ON DELETE CASCADE,
+  category TEXT UNIQUE,
+  interval_days INTEGER NOT NULL,
+  subject TEXT NOT NULL,
+  description TEXT,
+  created_by UUID NOT NULL,
+  created_at TIMESTAMP DEFAULT now(),
+  updated_at TIMESTAMP DEFAULT now(),
+  CONSTRAINT ck_preventive_schedules_target CHECK ((equipment_id IS NULL) <> (category IS NULL)),
+  CONSTRAINT ck_preventive_schedules_interval CHECK (interval_days > 0)
+);
+
+-- CONCURRENTLY keeps writes flowing while the indexes build (cannot run inside a transaction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_equipment_next_preventive ON equipment(next_preventive_date)
+  WHERE is_scrapped = false;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_requests_open_preventive ON maintenance_requests(equipment_id)
+  WHERE request_type = 'PREVENTIVE' AND status IN ('NEW', 'IN_PROGRESS');
@@ -0,0 +1,5 @@
+-- Migration: Index for GET /tickets/calendar?team_id=
+-- Run this in your PostgreSQL database (oddox)
+
+-- CONCURRENTLY keeps ticket writes flowing while the index builds (cannot run inside a transaction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_requests_team_scheduled ON maintenance_requests(maintenance_team_id, scheduled_date);
@@ -0,0 +1,6 @@
+-- Migration: Index for the technician load counts (see technician_load.py)
+-- Run this in your PostgreSQL database (oddox)
+
+-- CONCURRENTLY keeps ticket writes flowing while the index builds (cannot run inside a transaction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_requests_open_assignee ON maintenance_requests(maintenance_team_id, assigned_user_id)
+  WHERE status IN ('NEW', 'IN_PROGRESS');
@@ -0,0 +1,16 @@
+-- Migration: Background job outbox (see jobs.py)
+-- Run this in your PostgreSQL database (oddox)
+
+CREATE TABLE IF NOT EXISTS jobs (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  kind TEXT NOT NULL,
+  payload JSONB NOT NULL DEFAULT '{}',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL,
+  run_after TIMESTAMP DEFAULT now(),
+  last_error TEXT,
+  failed_at TIMESTAMP,
+  created_at TIMESTAMP DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs(run_after) WHERE failed_at IS NULL;
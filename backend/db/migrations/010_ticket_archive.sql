@@ -0,0 +1,33 @@
+-- Migration: Archive of closed tickets (see archive.py)
+-- Run this in your PostgreSQL database (oddox)
+
+CREATE TABLE IF NOT EXISTS maintenance_requests_archive (
+  id UUID NOT NULL,
+  subject TEXT,
+  description TEXT,
+  equipment_id UUID,
+  maintenance_team_id UUID,
+  assigned_user_id UUID,
+  request_type maintenance_request_type,
+  status maintenance_request_status,
+  scheduled_date TIMESTAMP,
+  completed_at TIMESTAMP,
+  duration_hours NUMERIC(5,2),
+  company TEXT,
+  priority INTEGER,
+  created_by UUID,
+  created_at TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP,
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Indexes on the (still empty) partitioned parent cascade to every partition
+CREATE INDEX IF NOT EXISTS idx_requests_archive_created ON maintenance_requests_archive(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_team_created ON maintenance_requests_archive(maintenance_team_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_created_by_created ON maintenance_requests_archive(created_by, created_at DESC, id DESC);
+
+-- CONCURRENTLY keeps ticket writes flowing while the index builds (cannot run inside a transaction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_requests_closed_updated ON maintenance_requests(updated_at)
+  WHERE status IN ('REPAIRED', 'SCRAP');
+
+-- Then archive the backlog once: uv run python -m commands.archive_tickets
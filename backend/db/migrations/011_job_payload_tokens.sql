@@ -0,0 +1,5 @@
+-- Migration: Drop tokens stored in background job payloads (see jobs.py)
+-- Run this in your PostgreSQL database (oddox)
+
+-- Password reset and verification jobs now issue their token when they run
+UPDATE jobs SET payload = payload - 'token' WHERE payload ? 'token';
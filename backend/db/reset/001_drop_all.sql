@@ -1,3 +1,7 @@
+DROP TABLE IF EXISTS maintenance_requests_archive CASCADE;
+DROP TABLE IF EXISTS jobs CASCADE;
+DROP TABLE IF EXISTS preventive_schedules CASCADE;
+DROP TABLE IF EXISTS ticket_stats CASCADE;
 DROP TABLE IF EXISTS maintenance_requests CASCADE;
 DROP TABLE IF EXISTS maintenance_team_members CASCADE;
 DROP TABLE IF EXISTS equipment CASCADE;
@@ -23,6 +23,9 @@ CREATE TABLE equipment (
   -- Status
   is_scrapped BOOLEAN DEFAULT FALSE,
 
+  -- Preventive maintenance (see preventive.py)
+  next_preventive_date DATE DEFAULT CURRENT_DATE,  -- NULL when no preventive_schedules rule applies
+
   -- Extra
   description TEXT,
 
@@ -3,6 +3,8 @@ CREATE TABLE maintenance_team_members (
   user_id UUID NOT NULL,                   -- users.id
   team_id UUID NOT NULL REFERENCES maintenance_teams(id),
   role TEXT DEFAULT 'TECHNICIAN',           -- TECHNICIAN | MANAGER
-  created_at TIMESTAMP DEFAULT now(),
-  UNIQUE (user_id, team_id)
+  created_at TIMESTAMP DEFAULT now()
 );
+
+-- team_id leads so GET /teams/{team_id}/members can use it
+CREATE UNIQUE INDEX uq_team_members_team_user ON maintenance_team_members(team_id, user_id);
@@ -27,5 +27,11 @@ CREATE TABLE maintenance_requests (
 
   created_by UUID NOT NULL,                -- users.id
   created_at TIMESTAMP DEFAULT now(),
-  updated_at TIMESTAMP DEFAULT now()
+  updated_at TIMESTAMP DEFAULT now(),
+
+  -- Full-text search (GET /tickets/search); subject ranks above description
+  search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(subject, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+  ) STORED
 );
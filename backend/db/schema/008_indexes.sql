@@ -1,7 +1,25 @@
-CREATE INDEX idx_requests_status ON maintenance_requests(status);
-CREATE INDEX idx_requests_team ON maintenance_requests(maintenance_team_id);
+-- Keep in sync with the __table_args__ Index definitions in models.py
 CREATE INDEX idx_requests_equipment ON maintenance_requests(equipment_id);
-CREATE INDEX idx_requests_scheduled ON maintenance_requests(scheduled_date);
+CREATE INDEX idx_requests_scheduled ON maintenance_requests(scheduled_date);                                  -- GET /tickets/calendar
+CREATE INDEX idx_requests_team_scheduled ON maintenance_requests(maintenance_team_id, scheduled_date);         -- GET /tickets/calendar?team_id=
+CREATE INDEX idx_requests_created ON maintenance_requests(created_at DESC, id DESC);                           -- GET /tickets/
+CREATE INDEX idx_requests_status_created ON maintenance_requests(status, created_at DESC, id DESC);             -- GET /tickets/?status_filter=
+CREATE INDEX idx_requests_team_created ON maintenance_requests(maintenance_team_id, created_at DESC, id DESC);   -- GET /tickets/?team_id=
+CREATE INDEX idx_requests_created_by_created ON maintenance_requests(created_by, created_at DESC, id DESC);     -- GET /tickets/my
+CREATE INDEX idx_requests_search ON maintenance_requests USING GIN (search_vector);                          -- GET /tickets/search
+CREATE INDEX idx_requests_open_preventive ON maintenance_requests(equipment_id)
+  WHERE request_type = 'PREVENTIVE' AND status IN ('NEW', 'IN_PROGRESS');                                    -- preventive scheduler
+CREATE INDEX idx_requests_open_assignee ON maintenance_requests(maintenance_team_id, assigned_user_id)
+  WHERE status IN ('NEW', 'IN_PROGRESS');                                                                      -- technician load
+CREATE INDEX idx_requests_closed_updated ON maintenance_requests(updated_at)
+  WHERE status IN ('REPAIRED', 'SCRAP');                                                                       -- archiver
 
 CREATE INDEX idx_equipment_team ON equipment(maintenance_team_id);
-CREATE INDEX idx_equipment_used_by ON equipment(used_by_user_id);
+CREATE INDEX idx_equipment_created ON equipment(created_at DESC, id DESC);                                      -- GET /equipment/
+CREATE INDEX idx_equipment_used_by_active ON equipment(used_by_user_id, created_at DESC, id DESC)
+  WHERE is_scrapped = false;                                                                                   -- GET /equipment/my/list
+CREATE INDEX idx_equipment_next_preventive ON equipment(next_preventive_date)
+  WHERE is_scrapped = false;                                                                                   -- preventive scheduler
+CREATE INDEX idx_equipment_search_trgm ON equipment USING GIN (
+  (name || ' ' || category || ' ' || coalesce(used_in_location, '') || ' ' || coalesce(work_center, '')) gin_trgm_ops
+);                                                                                                             -- GET /equipment/search
@@ -0,0 +1,9 @@
+-- Rollup of ticket counts, maintained by the ticket routes (see ticket_stats.py)
+CREATE TABLE ticket_stats (
+  maintenance_team_id UUID NOT NULL,
+  equipment_category TEXT NOT NULL,
+  status maintenance_request_status NOT NULL,
+  day DATE NOT NULL,                       -- date(created_at)
+  ticket_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (maintenance_team_id, equipment_category, status, day)
+);
@@ -0,0 +1,20 @@
+-- Recurrence rules for PREVENTIVE tickets, generated by the scheduler in preventive.py
+CREATE TABLE preventive_schedules (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+
+  -- Target: one piece of equipment, or every piece of a category (equipment rules win)
+  equipment_id UUID UNIQUE REFERENCES equipment(id) ON DELETE CASCADE,
+  category TEXT UNIQUE,
+  interval_days INTEGER NOT NULL,
+
+  -- Template for the generated tickets
+  subject TEXT NOT NULL,
+  description TEXT,
+
+  created_by UUID NOT NULL,                -- admin the tickets are created on behalf of
+  created_at TIMESTAMP DEFAULT now(),
+  updated_at TIMESTAMP DEFAULT now(),
+
+  CONSTRAINT ck_preventive_schedules_target CHECK ((equipment_id IS NULL) <> (category IS NULL)),
+  CONSTRAINT ck_preventive_schedules_interval CHECK (interval_days > 0)
+);
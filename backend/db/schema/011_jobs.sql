@@ -0,0 +1,14 @@
+-- Outbox of background jobs, claimed and run by the job runner in jobs.py
+CREATE TABLE jobs (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  kind TEXT NOT NULL,                      -- selects the registered handler
+  payload JSONB NOT NULL DEFAULT '{}',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL,
+  run_after TIMESTAMP DEFAULT now(),       -- due time; while running, when the claim expires
+  last_error TEXT,
+  failed_at TIMESTAMP,                     -- set once the job gives up
+  created_at TIMESTAMP DEFAULT now()
+);
+
+CREATE INDEX idx_jobs_due ON jobs(run_after) WHERE failed_at IS NULL;
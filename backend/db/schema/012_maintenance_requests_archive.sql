@@ -0,0 +1,28 @@
+-- Closed tickets moved out of maintenance_requests by the archiver (see archive.py).
+-- Same columns as maintenance_requests without search_vector, foreign keys or NOT NULLs
+-- (rows only ever come from maintenance_requests).
+-- Yearly partitions (maintenance_requests_archive_YYYY) are created by the archiver.
+CREATE TABLE maintenance_requests_archive (
+  id UUID NOT NULL,
+  subject TEXT,
+  description TEXT,
+  equipment_id UUID,
+  maintenance_team_id UUID,
+  assigned_user_id UUID,
+  request_type maintenance_request_type,
+  status maintenance_request_status,
+  scheduled_date TIMESTAMP,
+  completed_at TIMESTAMP,
+  duration_hours NUMERIC(5,2),
+  company TEXT,
+  priority INTEGER,
+  created_by UUID,
+  created_at TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP,
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Keep in sync with the ticket_archive Index definitions in models.py
+CREATE INDEX idx_requests_archive_created ON maintenance_requests_archive(created_at DESC, id DESC);                                   -- GET /tickets/?include_archived=true
+CREATE INDEX idx_requests_archive_team_created ON maintenance_requests_archive(maintenance_team_id, created_at DESC, id DESC);         -- ... &team_id=
+CREATE INDEX idx_requests_archive_created_by_created ON maintenance_requests_archive(created_by, created_at DESC, id DESC);           -- GET /tickets/my?include_archived=true
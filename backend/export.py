@@ -0,0 +1,66 @@
+"""Streaming NDJSON/CSV export of query results for GearGuard."""
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+EXPORT_BATCH_SIZE = 500
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def stream_rows(
+    query: Select,
+    read_model: type[BaseModel],
+    file_format: ExportFormat,
+    session_maker: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[str]:
+    """
+    Encode query rows one batch at a time from a server-side cursor.
+
+    The generator owns its session so the cursor stays open for as long as the
+    response is being sent, independent of the request's dependencies.
+    """
+    async with session_maker() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(read_model.model_fields))
+            writer.writeheader()
+            yield buffer.getvalue()
+
+        async for partition in result.scalars().partitions():
+            if file_format == "ndjson":
+                yield "".join(
+                    read_model.model_validate(row).model_dump_json() + "\n" for row in partition
+                )
+            else:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    read_model.model_validate(row).model_dump(mode="json") for row in partition
+                )
+                yield buffer.getvalue()
+
+
+def export_response(
+    query: Select,
+    read_model: type[BaseModel],
+    file_format: ExportFormat,
+    filename: str,
+    session_maker: async_sessionmaker[AsyncSession],
+) -> StreamingResponse:
+    """Stream the rows of `query` as an NDJSON or CSV attachment."""
+    return StreamingResponse(
+        stream_rows(query, read_model, file_format, session_maker),
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'},
+    )
@@ -0,0 +1,227 @@
+"""
+Background jobs for side effects that should not hold up a response.
+
+Requests only write a Job row (enqueue_job), in the same transaction as the
+change that causes it where they can, so a job exists exactly when its change
+committed and survives restarts. Hooks that run once their change is already
+committed (the user manager's) commit the job right after it instead. Payloads
+are stored in plain text, so they must not carry secrets such as tokens; the
+handler derives those when it runs. Each process runs a JobRunner that claims due jobs with
+FOR UPDATE SKIP LOCKED, so replicas never claim the same job, and runs up to
+JOB_WORKERS of them at once.
+
+A claim moves the job's run_after JOB_LEASE_SECONDS ahead instead of holding
+a lock or a connection while it runs. Success deletes the row; failure
+schedules a retry with exponential backoff until max_attempts, then keeps the
+row with failed_at for inspection for JOB_FAILED_RETENTION_DAYS. A worker that dies mid-job simply lets its
+claim expire and the job runs again, so handlers must be idempotent.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from auth.dbs import async_session_maker
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+JOBS_ENABLED = os.getenv("JOBS_ENABLED", "true").lower() == "true"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+# How long a claimed job may run before another worker may take it over
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_SECONDS = int(os.getenv("JOB_BACKOFF_SECONDS", "10"))
+JOB_BACKOFF_MAX_SECONDS = int(os.getenv("JOB_BACKOFF_MAX_SECONDS", "3600"))
+# Jobs that gave up are deleted this long after failing, checked every JOB_PURGE_INTERVAL_SECONDS
+JOB_FAILED_RETENTION_DAYS = int(os.getenv("JOB_FAILED_RETENTION_DAYS", "7"))
+JOB_PURGE_INTERVAL_SECONDS = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "3600"))
+# On shutdown, running jobs get this long to finish before they are cancelled
+JOB_DRAIN_SECONDS = float(os.getenv("JOB_DRAIN_SECONDS", "10"))
+ERROR_LIMIT = 2000
+
+JobHandler = Callable[[dict], Awaitable[None]]
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the coroutine that runs jobs of `kind`; it receives the job's payload."""
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+# ============ Enqueueing ============
+
+def enqueue_job(
+    session: AsyncSession, kind: str, payload: dict, max_attempts: int = JOB_MAX_ATTEMPTS
+) -> None:
+    """Add a job to the caller's transaction; this process's runner is woken once it commits."""
+    session.add(Job(kind=kind, payload=payload, max_attempts=max_attempts, run_after=datetime.utcnow()))
+    session.info["jobs_enqueued"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop("jobs_enqueued", False):
+        job_runner.wake()
+
+
+# ============ Claiming and completing ============
+
+async def claim_jobs(limit: int) -> list:
+    """Claim up to `limit` due jobs, skipping rows another replica is claiming (idx_jobs_due)."""
+    now = datetime.utcnow()
+    due = (
+        select(Job.id)
+        .where(Job.failed_at.is_(None))
+        .where(Job.run_after <= now)
+        .order_by(Job.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with async_session_maker() as session:
+        result = await session.execute(
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(attempts=Job.attempts + 1, run_after=now + timedelta(seconds=JOB_LEASE_SECONDS))
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = result.all()
+        await session.commit()
+    return jobs
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(JOB_BACKOFF_SECONDS * 2 ** (attempts - 1), JOB_BACKOFF_MAX_SECONDS))
+
+
+async def complete_job(job_id: uuid.UUID) -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(Job).where(Job.id == job_id))
+        await session.commit()
+
+
+async def fail_job(job, error: str, retry: bool = True) -> None:
+    """Schedule the job's next attempt, or give up on it once it is out of attempts."""
+    now = datetime.utcnow()
+    values = {"last_error": error[:ERROR_LIMIT]}
+    if retry and job.attempts < job.max_attempts:
+        values["run_after"] = now + backoff(job.attempts)
+    else:
+        values["failed_at"] = now
+    async with async_session_maker() as session:
+        await session.execute(update(Job).where(Job.id == job.id).values(**values))
+        await session.commit()
+
+
+async def purge_failed_jobs() -> int:
+    """Delete jobs that gave up more than JOB_FAILED_RETENTION_DAYS ago."""
+    cutoff = datetime.utcnow() - timedelta(days=JOB_FAILED_RETENTION_DAYS)
+    async with async_session_maker() as session:
+        result = await session.execute(delete(Job).where(Job.failed_at < cutoff))
+        await session.commit()
+    return result.rowcount
+
+
+# ============ Runner ============
+
+class JobRunner:
+    """Claims due jobs and runs up to JOB_WORKERS of them concurrently."""
+
+    def __init__(self):
+        self._wake = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: set[asyncio.Task] = set()
+        self._next_purge = 0.0
+
+    def wake(self) -> None:
+        """Claim now instead of at the next poll."""
+        self._wake.set()
+
+    def start(self) -> None:
+        if JOBS_ENABLED and self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        """Stop claiming and drain: running jobs get JOB_DRAIN_SECONDS, then are cancelled."""
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+        self._dispatcher = None
+        if self._running:
+            _, pending = await asyncio.wait(self._running, timeout=JOB_DRAIN_SECONDS)
+            # Cancelled jobs run again, on any replica, once their claim expires
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _dispatch(self) -> None:
+        while True:
+            self._wake.clear()
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + JOB_PURGE_INTERVAL_SECONDS
+                try:
+                    purged = await purge_failed_jobs()
+                    if purged:
+                        logger.info("Purged %d failed jobs", purged)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Purging failed jobs failed")
+            free = JOB_WORKERS - len(self._running)
+            if free > 0:
+                try:
+                    jobs = await claim_jobs(free)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Claiming jobs failed")
+                    jobs = []
+                for job in jobs:
+                    task = asyncio.create_task(self._run(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._finished)
+            # Woken by an enqueue, a finished job, or the poll interval
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), JOB_POLL_SECONDS)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._wake.set()
+
+    async def _run(self, job) -> None:
+        handler = JOB_HANDLERS.get(job.kind)
+        try:
+            if handler is None:
+                await fail_job(job, f"No handler registered for job kind {job.kind!r}", retry=False)
+                return
+            try:
+                await asyncio.wait_for(handler(job.payload), JOB_LEASE_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Job %s (%s) attempt %d failed: %r", job.id, job.kind, job.attempts, exc)
+                await fail_job(job, repr(exc))
+                return
+            await complete_job(job.id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # the claim expires and the job runs again
+            logger.exception("Recording the outcome of job %s failed", job.id)
+
+
+job_runner = JobRunner()
@@ -0,0 +1,46 @@
+"""
+One reconnecting Postgres LISTEN connection per channel.
+
+NOTIFY is only delivered to connections listening when it is sent, so anything
+sent before LISTEN takes effect, or while the connection is down, is lost. After
+every successful LISTEN, the first one included, on_listen runs so the caller
+can catch up on what it may have missed (reload, tell clients to resync).
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy import make_url
+
+from auth.dbs import DATABASE_DIRECT_URL
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 5
+
+NotifyCallback = Callable[[asyncpg.Connection, int, str, str], None]
+
+
+async def listen_forever(
+    channel: str, on_notify: NotifyCallback, on_listen: Callable[[], Awaitable[None]]
+) -> None:
+    """LISTEN on `channel` until cancelled, reconnecting RECONNECT_DELAY_SECONDS after a failure."""
+    dsn = make_url(DATABASE_DIRECT_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        try:
+            closed = asyncio.Event()
+            connection = await asyncpg.connect(dsn)
+            connection.add_termination_listener(lambda _, closed=closed: closed.set())
+            await connection.add_listener(channel, on_notify)
+            await on_listen()
+            try:
+                await closed.wait()
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("LISTEN on %s failed, reconnecting", channel)
+        await asyncio.sleep(RECONNECT_DELAY_SECONDS)
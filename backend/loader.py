@@ -0,0 +1,53 @@
+"""Request-scoped entity loader that batches and memoizes primary-key lookups."""
+from collections.abc import Iterable
+from typing import Any, Optional, TypeVar
+
+from fastapi import Depends
+from sqlalchemy import any_, bindparam, inspect, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.dbs import get_async_session
+
+T = TypeVar("T")
+
+
+class EntityLoader:
+    """
+    DataLoader-style cache of rows by key for the lifetime of one request.
+
+    Every key is fetched at most once: hits and misses are both remembered, and
+    load_many() fetches all unknown keys of a model with one WHERE pk = ANY(...)
+    query. Loaded rows belong to the request's session, so changes to them are
+    flushed with the rest of the request's work.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._rows: dict[tuple[type, Any], Any] = {}
+
+    async def load(self, model: type[T], key: Any) -> Optional[T]:
+        """Load one row of `model` by primary key, or None if it does not exist."""
+        return (await self.load_many(model, [key]))[key]
+
+    async def load_many(self, model: type[T], keys: Iterable[Any]) -> dict[Any, Optional[T]]:
+        """Load rows of `model` by primary key with at most one query."""
+        keys = list(dict.fromkeys(keys))
+        missing = [key for key in keys if (model, key) not in self._rows]
+        if missing:
+            pk = inspect(model).primary_key[0]
+            result = await self.session.execute(
+                select(model).where(
+                    pk == any_(bindparam("keys", missing, type_=ARRAY(pk.type)))
+                )
+            )
+            for row in result.scalars():
+                self._rows[(model, getattr(row, pk.key))] = row
+            for key in missing:
+                self._rows.setdefault((model, key), None)
+        return {key: self._rows[(model, key)] for key in keys}
+
+
+async def get_loader(session: AsyncSession = Depends(get_async_session)):  # noqa: B008
+    """Provide an EntityLoader bound to the request's session."""
+    yield EntityLoader(session)
@@ -7,10 +7,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from auth.auth import lifespan
+from auth.dbs import PinWritesToPrimaryMiddleware
+from metrics import MetricsMiddleware
+from pagination import NEXT_CURSOR_HEADER
 from auth.auth import router as auth_router
 from routes.teams import router as teams_router
 from routes.equipment import router as equipment_router
 from routes.tickets import router as tickets_router
+from routes.dashboard import router as dashboard_router
+from routes.preventive import router as preventive_router
+from routes.internal import router as internal_router
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,18 +38,25 @@ ALLOWED_ORIGINS = [
 
 app = FastAPI(lifespan=lifespan)
 
+app.add_middleware(PinWritesToPrimaryMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],  # only for dev-purposes , change in the production.
     allow_headers=["*"],  # same as above
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.include_router(auth_router)
 app.include_router(teams_router)  # Teams first - needed before equipment
 app.include_router(equipment_router)
 app.include_router(tickets_router)
+app.include_router(preventive_router)
+app.include_router(dashboard_router)
+app.include_router(internal_router)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="127.0.0.1", port=8000, log_level="info", reload=True)
@@ -4,8 +4,8 @@ import uuid
 from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, Date, DateTime, Enum as SQLAlchemyEnum, ForeignKey, Numeric, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, Boolean, CheckConstraint, Column, Computed, Date, DateTime, Enum as SQLAlchemyEnum, ForeignKey, Index, Numeric, PrimaryKeyConstraint, String, Table, Text, desc, event, func, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from auth.dbs import Base
@@ -33,6 +33,30 @@ class MaintenanceRequestStatus(str, enum.Enum):
     SCRAP = "SCRAP"
 
 
+# Subject matches rank above description matches (weights A and B)
+TICKET_SEARCH_CONFIG = "english"
+TICKET_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{TICKET_SEARCH_CONFIG}', coalesce(subject, '')), 'A') || "
+    f"setweight(to_tsvector('{TICKET_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+
+# Text matched by GET /equipment/search. Queries must use this exact expression
+# (unqualified, against the equipment table) for the trigram index to apply.
+EQUIPMENT_SEARCH_TEXT = (
+    "(name || ' ' || category || ' ' || coalesce(used_in_location, '') || ' ' || coalesce(work_center, ''))"
+)
+
+# Open (and open PREVENTIVE) tickets. Literal rather than bound values, so the partial
+# indexes built on them also match prepared (generic) plans of the queries using them.
+OPEN_TICKET = "status IN ('NEW', 'IN_PROGRESS')"
+CLOSED_TICKET = "status IN ('REPAIRED', 'SCRAP')"
+OPEN_PREVENTIVE_TICKET = f"request_type = 'PREVENTIVE' AND {OPEN_TICKET}"
+
+# The trigram index below needs pg_trgm (also in db/schema/002_extensions.sql)
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 # ============ Models ============
 
 class MaintenanceTeam(Base):
@@ -61,6 +85,11 @@ class MaintenanceTeamMember(Base):
     
     # Relationships
     team: Mapped["MaintenanceTeam"] = relationship("MaintenanceTeam", back_populates="members")
+    
+    __table_args__ = (
+        # One membership per user per team; team_id leads so /teams/{id}/members can use it
+        Index("uq_team_members_team_user", "team_id", "user_id", unique=True),
+    )
 
 
 class Equipment(Base):
@@ -90,6 +119,12 @@ class Equipment(Base):
     assigned_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     scrap_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     
+    # Next PREVENTIVE occurrence; NULL when no PreventiveSchedule applies.
+    # New equipment starts due today so the scheduler resolves its rule.
+    next_preventive_date: Mapped[Optional[date]] = mapped_column(
+        Date, nullable=True, default=date.today, server_default=func.current_date()
+    )
+    
     # Status
     is_scrapped: Mapped[bool] = mapped_column(Boolean, default=False)
     
@@ -103,6 +138,32 @@ class Equipment(Base):
     # Relationships
     maintenance_team: Mapped[Optional["MaintenanceTeam"]] = relationship("MaintenanceTeam", back_populates="equipment")
     maintenance_requests: Mapped[list["MaintenanceRequest"]] = relationship("MaintenanceRequest", back_populates="equipment")
+    
+    # Indexes - keep in sync with db/schema/008_indexes.sql
+    __table_args__ = (
+        Index("idx_equipment_team", "maintenance_team_id"),
+        # GET /equipment/
+        Index("idx_equipment_created", desc("created_at"), desc("id")),
+        # GET /equipment/my/list
+        Index(
+            "idx_equipment_used_by_active",
+            "used_by_user_id", desc("created_at"), desc("id"),
+            postgresql_where=text("is_scrapped = false"),
+        ),
+        # GET /equipment/search
+        Index(
+            "idx_equipment_search_trgm",
+            literal_column(EQUIPMENT_SEARCH_TEXT).label("search_text"),
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        # Preventive scheduler: due equipment
+        Index(
+            "idx_equipment_next_preventive",
+            "next_preventive_date",
+            postgresql_where=text("is_scrapped = false"),
+        ),
+    )
 
 
 class MaintenanceRequest(Base):
@@ -150,6 +211,139 @@ class MaintenanceRequest(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Full-text search - maintained by Postgres, deferred so normal loads skip it
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(TICKET_SEARCH_VECTOR, persisted=True),
+        deferred=True,
+    )
+    
     # Relationships
     equipment: Mapped["Equipment"] = relationship("Equipment", back_populates="maintenance_requests")
     maintenance_team: Mapped["MaintenanceTeam"] = relationship("MaintenanceTeam")
+    
+    # Indexes - keep in sync with db/schema/008_indexes.sql
+    __table_args__ = (
+        Index("idx_requests_equipment", "equipment_id"),
+        Index("idx_requests_scheduled", "scheduled_date"),
+        # GET /tickets/calendar?team_id=
+        Index("idx_requests_team_scheduled", "maintenance_team_id", "scheduled_date"),
+        # GET /tickets/ (unfiltered and filtered by status / team)
+        Index("idx_requests_created", desc("created_at"), desc("id")),
+        Index("idx_requests_status_created", "status", desc("created_at"), desc("id")),
+        Index("idx_requests_team_created", "maintenance_team_id", desc("created_at"), desc("id")),
+        # GET /tickets/my
+        Index("idx_requests_created_by_created", "created_by", desc("created_at"), desc("id")),
+        # GET /tickets/search
+        Index("idx_requests_search", "search_vector", postgresql_using="gin"),
+        # Preventive scheduler: equipment that already has an open preventive ticket
+        Index(
+            "idx_requests_open_preventive",
+            "equipment_id",
+            postgresql_where=text(OPEN_PREVENTIVE_TICKET),
+        ),
+        # Technician load: open tickets per team and assignee
+        Index(
+            "idx_requests_open_assignee",
+            "maintenance_team_id",
+            "assigned_user_id",
+            postgresql_where=text(OPEN_TICKET),
+        ),
+        # Archiver: closed tickets by last change
+        Index(
+            "idx_requests_closed_updated",
+            "updated_at",
+            postgresql_where=text(CLOSED_TICKET),
+        ),
+    )
+
+
+# Closed tickets moved out of maintenance_requests by the archiver (see archive.py).
+# Same columns without search_vector, foreign keys or NOT NULLs (rows only ever come from
+# maintenance_requests), range-partitioned by created_at into yearly partitions the
+# archiver creates as it needs them.
+ticket_archive = Table(
+    "maintenance_requests_archive",
+    Base.metadata,
+    *(
+        Column(column.name, column.type)
+        for column in MaintenanceRequest.__table__.columns
+        if column.name != "search_vector"
+    ),
+    PrimaryKeyConstraint("id", "created_at"),
+    # GET /tickets/?include_archived=true (unfiltered, by team, /my)
+    Index("idx_requests_archive_created", desc("created_at"), desc("id")),
+    Index("idx_requests_archive_team_created", "maintenance_team_id", desc("created_at"), desc("id")),
+    Index("idx_requests_archive_created_by_created", "created_by", desc("created_at"), desc("id")),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+
+class PreventiveSchedule(Base):
+    """
+    Recurrence rule for PREVENTIVE tickets, for one piece of equipment or a whole category.
+    An equipment rule overrides the rule of its category (see preventive.py).
+    """
+    __tablename__ = "preventive_schedules"
+    
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    equipment_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("equipment.id", ondelete="CASCADE"), unique=True, nullable=True
+    )
+    category: Mapped[Optional[str]] = mapped_column(String, unique=True, nullable=True)
+    interval_days: Mapped[int] = mapped_column(nullable=False)
+    
+    # Template for the generated tickets
+    subject: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Generated tickets are created on behalf of the admin who set up the rule
+    created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        CheckConstraint("(equipment_id IS NULL) <> (category IS NULL)", name="ck_preventive_schedules_target"),
+        CheckConstraint("interval_days > 0", name="ck_preventive_schedules_interval"),
+    )
+
+
+class TicketStat(Base):
+    """
+    Rollup of ticket counts per team, equipment category, status and creation day.
+    Maintained in the same transaction as every ticket write (see ticket_stats.py).
+    """
+    __tablename__ = "ticket_stats"
+    
+    maintenance_team_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    equipment_category: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[MaintenanceRequestStatus] = mapped_column(
+        SQLAlchemyEnum(MaintenanceRequestStatus, name="maintenance_request_status"),
+        primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    ticket_count: Mapped[int] = mapped_column(default=0)
+
+
+class Job(Base):
+    """
+    Outbox row of a background job (see jobs.py), written with the change that causes
+    it. Deleted once it succeeds; kept with failed_at for a while once it gives up.
+    """
+    __tablename__ = "jobs"
+    
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(nullable=False)
+    # When the job is due; while a worker runs it, when that worker's claim expires
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    failed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Job claims: due jobs that have not given up
+        Index("idx_jobs_due", "run_after", postgresql_where=text("failed_at IS NULL")),
+    )
@@ -0,0 +1,119 @@
+"""Keyset (cursor) pagination helpers for GearGuard list routes."""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import ColumnElement, Select, tuple_
+
+# OFFSET paging re-scans every skipped row, so deep pages keep the old cap.
+OFFSET_PAGE_LIMIT = 100
+# A keyset seek costs the same on every page, so larger pages are fine.
+CURSOR_PAGE_LIMIT = 1000
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode the (created_at, id) position of a row as an opaque cursor."""
+    return _encode([created_at.isoformat(), str(row_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def encode_ranked_cursor(rank: float, created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode the (rank, created_at, id) position of a search result."""
+    return _encode([rank, created_at.isoformat(), str(row_id)])
+
+
+def decode_ranked_cursor(cursor: str) -> tuple[float, datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_ranked_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        rank, created_at, row_id = _decode(cursor)
+        return float(rank), datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def paginate(query: Select, model, skip: int, limit: int, cursor: Optional[str]) -> Select:
+    """
+    Order a query newest-first and apply either a keyset seek or OFFSET paging.
+
+    With a cursor the page is fetched with WHERE (created_at, id) < (...), so page N
+    costs the same as page 1. Without one, skip/limit behave as before, but deep
+    offsets stay capped at OFFSET_PAGE_LIMIT rows per page.
+    """
+    if cursor:
+        if skip:
+            raise HTTPException(status_code=400, detail="skip cannot be combined with cursor")
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+    elif skip and limit > OFFSET_PAGE_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit above {OFFSET_PAGE_LIMIT} requires cursor paging"
+        )
+
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def paginate_ranked(query: Select, model, rank: ColumnElement[float], limit: int, cursor: Optional[str]) -> Select:
+    """
+    Order a query best-rank-first (newest first among ties) with keyset paging.
+
+    `rank` must be the same expression on every page, so the cursor's rank
+    compares exactly against the recomputed value.
+    """
+    if cursor:
+        rank_value, created_at, row_id = decode_ranked_cursor(cursor)
+        query = query.where(
+            tuple_(rank, model.created_at, model.id) < (rank_value, created_at, row_id)
+        )
+    return query.order_by(rank.desc(), model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+def set_next_ranked_cursor(response: Response, rows, limit: int) -> None:
+    """Like set_next_cursor, for (row, rank) results of a paginate_ranked query."""
+    if rows and len(rows) == limit:
+        last, rank = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_ranked_cursor(rank, last.created_at, last.id)
+
+
+def set_next_cursor(response: Response, rows, limit: int) -> None:
+    """Expose the cursor for the following page when this page is full; `rows` are RowMappings."""
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last["created_at"], last["id"])
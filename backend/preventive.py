@@ -0,0 +1,225 @@
+"""
+Preventive maintenance scheduler: generates recurring PREVENTIVE tickets.
+
+Each piece of equipment carries its next_preventive_date. A tick claims due
+equipment in batches with one indexed query (FOR UPDATE SKIP LOCKED), resolves
+its rule (its own PreventiveSchedule, else its category's), inserts the tickets
+in bulk and moves next_preventive_date past the lead horizon. Every replica runs
+the scheduler; SKIP LOCKED hands each of them disjoint batches, so a ticket is
+never generated twice and a tick over 100k due items is shared between them.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import Select, bindparam, exists, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from auth.dbs import async_session_maker
+from models import (
+    OPEN_PREVENTIVE_TICKET,
+    Equipment,
+    MaintenanceRequest,
+    MaintenanceRequestStatus,
+    MaintenanceRequestType,
+    PreventiveSchedule,
+)
+from technician_load import load_key, move_on_commit, technician_load
+from ticket_feed import event_payload, notify_ticket_changes
+from ticket_stats import record_ticket_stats, stat_key
+
+logger = logging.getLogger(__name__)
+
+PREVENTIVE_SCHEDULER_ENABLED = os.getenv("PREVENTIVE_SCHEDULER_ENABLED", "true").lower() == "true"
+PREVENTIVE_TICK_SECONDS = float(os.getenv("PREVENTIVE_TICK_SECONDS", "300"))
+PREVENTIVE_BATCH_SIZE = int(os.getenv("PREVENTIVE_BATCH_SIZE", "1000"))
+# Tickets are generated this many days before their scheduled date
+PREVENTIVE_LEAD_DAYS = int(os.getenv("PREVENTIVE_LEAD_DAYS", "7"))
+
+
+@dataclass
+class TickResult:
+    equipment: int = 0
+    tickets_created: int = 0
+
+
+def due_equipment_query(horizon: date, limit: int) -> Select:
+    """
+    Claim up to `limit` due, unscrapped equipment rows (idx_equipment_next_preventive).
+    Rows locked by another replica's batch are skipped, not waited on.
+    """
+    own_rule = aliased(PreventiveSchedule)
+    category_rule = aliased(PreventiveSchedule)
+    # Served by idx_requests_open_preventive
+    open_ticket = exists().where(
+        MaintenanceRequest.equipment_id == Equipment.id, text(OPEN_PREVENTIVE_TICKET)
+    )
+    return (
+        select(
+            Equipment.id,
+            Equipment.category,
+            Equipment.company,
+            Equipment.maintenance_team_id,
+            Equipment.default_technician_id,
+            Equipment.next_preventive_date,
+            # An equipment rule overrides its category's rule
+            func.coalesce(own_rule.id, category_rule.id).label("schedule_id"),
+            open_ticket.label("has_open_ticket"),
+        )
+        .outerjoin(own_rule, own_rule.equipment_id == Equipment.id)
+        .outerjoin(category_rule, category_rule.category == Equipment.category)
+        .where(Equipment.is_scrapped == False)  # noqa: E712
+        .where(Equipment.next_preventive_date <= horizon)
+        .order_by(Equipment.next_preventive_date)
+        .limit(limit)
+        .with_for_update(of=Equipment, skip_locked=True)
+    )
+
+
+def next_occurrence(due: date, interval_days: int, horizon: date) -> date:
+    """The first occurrence after `horizon`; occurrences missed while down are skipped."""
+    periods = (horizon - due).days // interval_days + 1
+    return due + timedelta(days=periods * interval_days)
+
+
+async def run_batch(today: date) -> TickResult:
+    """Process one batch of due equipment in one transaction."""
+    horizon = today + timedelta(days=PREVENTIVE_LEAD_DAYS)
+    async with async_session_maker() as session:
+        due = (await session.execute(due_equipment_query(horizon, PREVENTIVE_BATCH_SIZE))).all()
+        if not due:
+            return TickResult()
+
+        schedule_ids = {row.schedule_id for row in due if row.schedule_id}
+        schedules = {}
+        if schedule_ids:
+            schedules = {
+                schedule.id: schedule
+                for schedule in await session.scalars(
+                    select(PreventiveSchedule).where(PreventiveSchedule.id.in_(schedule_ids))
+                )
+            }
+
+        await technician_load.ensure_loaded()
+        assignments = technician_load.batch()
+        tickets = []
+        next_dates = []
+        categories: dict[uuid.UUID, str] = {}
+        for row in due:
+            schedule = schedules.get(row.schedule_id)
+            if schedule is None:
+                # No rule applies (any more); rule changes set the date again
+                next_dates.append({"b_id": row.id, "b_next": None})
+                continue
+            # Skip this occurrence if the last one is still open or nobody can take it
+            if row.maintenance_team_id and not row.has_open_ticket:
+                assignee = assignments.assign(row.maintenance_team_id, row.default_technician_id)
+                move_on_commit(session, None, load_key(row.maintenance_team_id, assignee, MaintenanceRequestStatus.NEW))
+                tickets.append({
+                    "subject": schedule.subject,
+                    "description": schedule.description,
+                    "equipment_id": row.id,
+                    "maintenance_team_id": row.maintenance_team_id,
+                    "assigned_user_id": assignee,
+                    "company": row.company,
+                    "request_type": MaintenanceRequestType.PREVENTIVE,
+                    "status": MaintenanceRequestStatus.NEW,
+                    "scheduled_date": datetime.combine(row.next_preventive_date, time()),
+                    "created_by": schedule.created_by,
+                })
+                categories[row.id] = row.category
+            next_dates.append({
+                "b_id": row.id,
+                "b_next": next_occurrence(row.next_preventive_date, schedule.interval_days, horizon),
+            })
+
+        created = []
+        if tickets:
+            created = (await session.scalars(
+                insert(MaintenanceRequest).returning(MaintenanceRequest), tickets
+            )).all()
+            await record_ticket_stats(
+                session, Counter(stat_key(ticket, categories[ticket.equipment_id]) for ticket in created)
+            )
+            await notify_ticket_changes(session, (event_payload("created", ticket) for ticket in created))
+
+        equipment = Equipment.__table__
+        await session.execute(
+            update(equipment)
+            .where(equipment.c.id == bindparam("b_id"))
+            .values(next_preventive_date=bindparam("b_next")),
+            next_dates,
+        )
+        await session.commit()
+        return TickResult(equipment=len(due), tickets_created=len(created))
+
+
+async def run_tick(today: Optional[date] = None) -> TickResult:
+    """Process due equipment batch by batch until none is left for this replica."""
+    today = today or date.today()
+    total = TickResult()
+    while True:
+        result = await run_batch(today)
+        total.equipment += result.equipment
+        total.tickets_created += result.tickets_created
+        # A short batch means nothing is due, or the rest is claimed by other replicas
+        if result.equipment < PREVENTIVE_BATCH_SIZE:
+            return total
+
+
+async def activate_schedule(session: AsyncSession, schedule: PreventiveSchedule) -> None:
+    """Make equipment the rule newly covers due today, so the next tick resolves it."""
+    target = (
+        Equipment.id == schedule.equipment_id
+        if schedule.equipment_id
+        else Equipment.category == schedule.category
+    )
+    await session.execute(
+        update(Equipment)
+        .where(target)
+        .where(Equipment.next_preventive_date.is_(None))
+        .where(Equipment.is_scrapped == False)  # noqa: E712
+        .values(next_preventive_date=date.today())
+        .execution_options(synchronize_session=False)
+    )
+
+
+class PreventiveScheduler:
+    """Runs run_tick every PREVENTIVE_TICK_SECONDS in the background."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if PREVENTIVE_SCHEDULER_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                result = await run_tick()
+                if result.equipment:
+                    logger.info(
+                        "Preventive tick: %d equipment due, %d tickets created",
+                        result.equipment, result.tickets_created,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Preventive scheduler tick failed")
+            await asyncio.sleep(PREVENTIVE_TICK_SECONDS)
+
+
+preventive_scheduler = PreventiveScheduler()
@@ -0,0 +1,135 @@
+"""Dashboard routes - aggregate counts computed in the database."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select, true
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from archive import all_tickets
+from auth.dbs import Role, User, get_read_session
+from auth.users import current_active_user
+from models import (
+    Equipment,
+    MaintenanceRequest,
+    MaintenanceRequestStatus,
+    MaintenanceTeam,
+    TicketStat,
+)
+from routes.tickets import TICKET_LIST
+from schema import DashboardSummary
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    recent: int = Query(10, ge=0, le=50),
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_active_user),  # noqa: B008
+):
+    """
+    Ticket counts by status and team, equipment counts and the most recent tickets.
+    Admins see everything; users see their own tickets and equipment, as in /tickets/my.
+    Counts include archived tickets for both; recent tickets come from the live table.
+    Everything is computed by a single SQL statement.
+    """
+    if user.role == Role.ADMIN:
+        # Admin counts come from the ticket_stats rollup: O(groups), not O(tickets)
+        counts_source = TicketStat
+        count_agg = func.sum(TicketStat.ticket_count)
+        status_column = TicketStat.status
+        team_column = TicketStat.maintenance_team_id
+        counts_scope = true()
+        ticket_scope = true()
+        equipment_scope = true()
+    else:
+        # Live and archived tickets, as ticket_stats counts them (both tables index created_by)
+        counts_source = all_tickets("maintenance_team_id", "status", "created_by")
+        count_agg = func.count()
+        status_column = counts_source.c.status
+        team_column = counts_source.c.maintenance_team_id
+        counts_scope = counts_source.c.created_by == user.id
+        ticket_scope = MaintenanceRequest.created_by == user.id
+        equipment_scope = Equipment.used_by_user_id == user.id
+    
+    status_counts = (
+        select(
+            func.coalesce(count_agg, 0).label("total_tickets"),
+            *[
+                func.coalesce(count_agg.filter(status_column == ticket_status), 0).label(ticket_status.value)
+                for ticket_status in MaintenanceRequestStatus
+            ],
+        )
+        .select_from(counts_source)
+        .where(counts_scope)
+        .subquery("status_counts")
+    )
+    
+    equipment_counts = (
+        select(
+            func.count().filter(Equipment.is_scrapped == False).label("open_equipment"),  # noqa: E712
+            func.count().filter(Equipment.is_scrapped == True).label("scrapped_equipment"),  # noqa: E712
+        )
+        .where(equipment_scope)
+        .subquery("equipment_counts")
+    )
+    
+    team_counts = (
+        select(
+            team_column.label("team_id"),
+            MaintenanceTeam.name.label("team_name"),
+            count_agg.label("count"),
+        )
+        .select_from(counts_source)
+        .join(MaintenanceTeam, MaintenanceTeam.id == team_column)
+        .where(counts_scope)
+        .group_by(team_column, MaintenanceTeam.name)
+        .having(count_agg > 0)
+        .subquery("team_counts")
+    )
+    by_team = select(
+        func.json_agg(
+            aggregate_order_by(team_counts.table_valued(), team_counts.c.count.desc()), type_=JSON
+        )
+    ).scalar_subquery()
+    
+    # Only the MaintenanceRequestRead columns: search_vector would bloat every row
+    recent_tickets = (
+        select(*TICKET_LIST.columns(MaintenanceRequest))
+        .where(ticket_scope)
+        .order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id.desc())
+        .limit(recent)
+        .subquery("recent_tickets")
+    )
+    recent_json = select(
+        func.json_agg(
+            aggregate_order_by(
+                recent_tickets.table_valued(),
+                recent_tickets.c.created_at.desc(),
+                recent_tickets.c.id.desc(),
+            ),
+            type_=JSON,
+        )
+    ).scalar_subquery()
+    
+    query = (
+        select(
+            status_counts,
+            equipment_counts,
+            by_team.label("tickets_by_team"),
+            recent_json.label("recent_tickets"),
+        )
+        .select_from(status_counts)
+        .join(equipment_counts, true())
+    )
+    row = (await session.execute(query)).one()._mapping
+    
+    return DashboardSummary(
+        total_tickets=row["total_tickets"],
+        tickets_by_status={
+            ticket_status: row[ticket_status.value] for ticket_status in MaintenanceRequestStatus
+        },
+        tickets_by_team=row["tickets_by_team"] or [],
+        open_equipment=row["open_equipment"],
+        scrapped_equipment=row["scrapped_equipment"],
+        recent_tickets=row["recent_tickets"] or [],
+    )
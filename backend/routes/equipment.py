@@ -1,41 +1,249 @@
 """Equipment routes - Admin CRUD + User read-only access."""
+import csv
+import io
+import itertools
+import json
 import uuid
-from typing import Optional
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Any, BinaryIO, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import Select, Text, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import REAL
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth.dbs import Role, User, get_async_session
+from auth.dbs import (
+    Role,
+    User,
+    get_async_session,
+    get_read_session,
+    read_session_maker_for,
+)
 from auth.users import current_active_user, current_admin
-from models import Equipment
-from schema import EquipmentCreate, EquipmentRead, EquipmentUpdate
+from conditional import (
+    etag_matches,
+    not_modified,
+    page_not_modified,
+    resource_etag,
+    rows_etag,
+    set_etag,
+)
+from export import ExportFormat, export_response
+from models import EQUIPMENT_SEARCH_TEXT, Equipment
+from pagination import CURSOR_PAGE_LIMIT, paginate, set_next_cursor
+from schema import (
+    EquipmentCreate,
+    EquipmentImportError,
+    EquipmentImportResult,
+    EquipmentRead,
+    EquipmentSearchResult,
+    EquipmentUpdate,
+)
+from serialization import ListEncoder
+from team_cache import team_cache
+from ticket_stats import move_equipment_category
 
 router = APIRouter(prefix="/equipment", tags=["equipment"])
 
+IMPORT_BATCH_SIZE = 1000
+IMPORT_ERROR_LIMIT = 1000
+
+EQUIPMENT_LIST = ListEncoder(EquipmentRead)
+
+# Column order of the records handed to COPY
+IMPORT_COLUMNS = [
+    "id", "name", "category", "company", "description", "used_by_type",
+    "used_by_user_id", "used_in_location", "work_center", "maintenance_team_id",
+    "default_technician_id", "assigned_date", "is_scrapped", "created_at", "updated_at",
+]
+
+
+# ============ Import Helpers ============
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, row dict) from a CSV file with a header row."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield reader.line_num, {key: value or None for key, value in row.items() if key}
+
+
+def iter_ndjson_rows(stream: BinaryIO) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, raw line) from an NDJSON file, skipping blank lines."""
+    for line_number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8"), start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def read_batch(rows: Iterator[tuple[int, Any]]) -> list[tuple[int, Any]]:
+    """Pull the next batch of rows; run in a thread since the upload is file-backed."""
+    return list(itertools.islice(rows, IMPORT_BATCH_SIZE))
+
+
+def validate_import_row(
+    raw: Any, team_ids: set[uuid.UUID], memberships: set[tuple[uuid.UUID, uuid.UUID]]
+) -> EquipmentCreate:
+    """
+    Validate one import row with the same rules as create_equipment.
+
+    Raises:
+        ValueError: describing why the row was rejected.
+    """
+    try:
+        data = json.loads(raw) if isinstance(raw, str) else raw
+        equipment_data = EquipmentCreate.model_validate(data)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON: {exc.msg}") from exc
+    except ValidationError as exc:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )) from exc
+    
+    if equipment_data.maintenance_team_id not in team_ids:
+        raise ValueError(f"Maintenance team {equipment_data.maintenance_team_id} not found")
+    if (equipment_data.maintenance_team_id, equipment_data.default_technician_id) not in memberships:
+        raise ValueError(
+            f"Technician {equipment_data.default_technician_id} is not a member of team {equipment_data.maintenance_team_id}"
+        )
+    return equipment_data
+
+
+def to_copy_record(equipment_data: EquipmentCreate, now: datetime) -> tuple:
+    """Build a COPY record in IMPORT_COLUMNS order, filling the model defaults."""
+    return (
+        uuid.uuid4(),
+        equipment_data.name,
+        equipment_data.category,
+        equipment_data.company,
+        equipment_data.description,
+        equipment_data.used_by_type.value if equipment_data.used_by_type else None,
+        equipment_data.used_by_user_id,
+        equipment_data.used_in_location,
+        equipment_data.work_center,
+        equipment_data.maintenance_team_id,
+        equipment_data.default_technician_id,
+        equipment_data.assigned_date,
+        False,
+        now,
+        now,
+    )
+
 
 # ============ Admin Routes ============
 
+def filter_equipment(query: Select, is_scrapped: Optional[bool], category: Optional[str]) -> Select:
+    """Apply the optional admin list filters to an equipment query."""
+    if is_scrapped is not None:
+        query = query.where(Equipment.is_scrapped == is_scrapped)
+    if category:
+        query = query.where(Equipment.category == category)
+    return query
+
+
 @router.get("/", response_model=list[EquipmentRead])
 async def list_all_equipment(
+    request: Request,
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    limit: int = Query(100, ge=1, le=CURSOR_PAGE_LIMIT),
+    cursor: Optional[str] = None,
     is_scrapped: Optional[bool] = None,
     category: Optional[str] = None,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_admin),  # noqa: B008
 ):
-    """List all equipment (Admin only)."""
-    query = select(Equipment)
+    """
+    List all equipment (Admin only), newest first.
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the next one.
+    Answers 304 when If-None-Match carries the page's current ETag.
+    """
+    query = filter_equipment(select(*EQUIPMENT_LIST.columns(Equipment)), is_scrapped, category)
+    query = paginate(query, Equipment, skip, limit, cursor)
+    unchanged = await page_not_modified(request, session, query)
+    if unchanged is not None:
+        return unchanged
     
-    if is_scrapped is not None:
-        query = query.where(Equipment.is_scrapped == is_scrapped)
-    if category:
-        query = query.where(Equipment.category == category)
+    result = await session.execute(query)
+    equipment = result.mappings().all()
+    response = EQUIPMENT_LIST.response(equipment)
+    set_next_cursor(response, equipment, limit)
+    set_etag(response, rows_etag(equipment))
+    return response
+
+
+@router.get("/export")
+async def export_equipment(
+    request: Request,
+    file_format: ExportFormat = Query("ndjson", alias="format"),
+    is_scrapped: Optional[bool] = None,
+    category: Optional[str] = None,
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """
+    Stream all equipment matching the list filters as NDJSON or CSV (Admin only).
+    Rows are read through a server-side cursor, so memory stays flat for any export size.
+    """
+    query = filter_equipment(select(Equipment), is_scrapped, category)
+    query = query.order_by(Equipment.created_at.desc(), Equipment.id.desc())
+    return export_response(query, EquipmentRead, file_format, "equipment", read_session_maker_for(request))
+
+
+# ============ Search ============
+
+EQUIPMENT_SEARCH_LIMIT = 25
+
+
+def equipment_search(q: str):
+    """The trigram-indexable match condition and word_similarity score for a typeahead query."""
+    search_text = literal_column(EQUIPMENT_SEARCH_TEXT, type_=Text)
+    term = literal(q, Text)
+    return term.bool_op("<%")(search_text), func.word_similarity(term, search_text, type_=REAL)
+
+
+@router.get("/search", response_model=list[EquipmentSearchResult])
+async def search_equipment(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=EQUIPMENT_SEARCH_LIMIT),
+    include_scrapped: bool = False,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_active_user),  # noqa: B008
+):
+    """
+    Typeahead over equipment name, category, location and work center, best matches first.
+    Matching is by pg_trgm word similarity, so partial words and typos still match.
+    Users only see equipment assigned to them.
+    """
+    match, similarity = equipment_search(q)
+    query = select(
+        Equipment.id,
+        Equipment.name,
+        Equipment.category,
+        Equipment.used_in_location,
+        Equipment.work_center,
+        Equipment.maintenance_team_id,
+        similarity.label("similarity"),
+    ).where(match)
     
-    query = query.offset(skip).limit(limit)
+    if not include_scrapped:
+        query = query.where(Equipment.is_scrapped == False)  # noqa: E712
+    if user.role != Role.ADMIN:
+        query = query.where(Equipment.used_by_user_id == user.id)
+    
+    query = query.order_by(similarity.desc(), Equipment.name, Equipment.id).limit(limit)
     result = await session.execute(query)
-    return result.scalars().all()
+    return result.mappings().all()
 
 
 @router.post("/", response_model=EquipmentRead, status_code=status.HTTP_201_CREATED)
@@ -45,26 +253,20 @@ async def create_equipment(
     user: User = Depends(current_admin),  # noqa: B008
 ):
     """Create new equipment (Admin only). Requires owner and maintenance assignment."""
-    from models import MaintenanceTeam, MaintenanceTeamMember
+    # Team and membership checks are answered by the team cache, not the database
+    await team_cache.ensure_loaded()
     
     # Validate maintenance team exists
-    team_result = await session.execute(
-        select(MaintenanceTeam).where(MaintenanceTeam.id == equipment_data.maintenance_team_id)
-    )
-    if not team_result.scalar_one_or_none():
+    if not team_cache.get_team(equipment_data.maintenance_team_id):
         raise HTTPException(
             status_code=400,
             detail=f"Maintenance team {equipment_data.maintenance_team_id} not found"
         )
     
     # Validate technician is member of the team
-    member_result = await session.execute(
-        select(MaintenanceTeamMember).where(
-            MaintenanceTeamMember.user_id == equipment_data.default_technician_id,
-            MaintenanceTeamMember.team_id == equipment_data.maintenance_team_id
-        )
-    )
-    if not member_result.scalar_one_or_none():
+    if not team_cache.is_member(
+        equipment_data.maintenance_team_id, equipment_data.default_technician_id
+    ):
         raise HTTPException(
             status_code=400,
             detail=f"Technician {equipment_data.default_technician_id} is not a member of team {equipment_data.maintenance_team_id}"
@@ -77,13 +279,96 @@ async def create_equipment(
     return equipment
 
 
+@router.post("/import", response_model=EquipmentImportResult)
+async def import_equipment(
+    file: UploadFile = File(...),  # noqa: B008
+    file_format: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format"),
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """
+    Bulk-create equipment from a CSV (with header row) or NDJSON file (Admin only).
+    Rows are read and validated in batches of IMPORT_BATCH_SIZE against the team
+    cache, then written with binary COPY. Invalid lines are
+    reported and skipped; the rest of the file is still imported.
+    """
+    filename = (file.filename or "").lower()
+    if file_format is None:
+        if filename.endswith(".csv"):
+            file_format = "csv"
+        elif filename.endswith((".ndjson", ".jsonl")):
+            file_format = "ndjson"
+        else:
+            raise HTTPException(status_code=400, detail="Specify format=csv or format=ndjson")
+    
+    await team_cache.ensure_loaded()
+    team_ids = set(team_cache.teams)
+    memberships = team_cache.memberships()
+    
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    copy_connection = raw_connection.driver_connection
+    
+    rows = iter_csv_rows(file.file) if file_format == "csv" else iter_ndjson_rows(file.file)
+    imported = 0
+    rejected = 0
+    errors: list[EquipmentImportError] = []
+    
+    def reject(line: int, error: str) -> None:
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < IMPORT_ERROR_LIMIT:
+            errors.append(EquipmentImportError(line=line, error=error))
+    
+    while True:
+        try:
+            batch = await run_in_threadpool(read_batch, rows)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise HTTPException(status_code=400, detail=f"Unreadable file: {exc}") from exc
+        if not batch:
+            break
+        
+        now = datetime.utcnow()
+        records = []
+        record_lines = []
+        for line, raw in batch:
+            try:
+                records.append(to_copy_record(validate_import_row(raw, team_ids, memberships), now))
+            except ValueError as exc:
+                reject(line, str(exc))
+                continue
+            record_lines.append(line)
+        
+        if not records:
+            continue
+        
+        try:
+            async with session.begin_nested():
+                await copy_connection.copy_records_to_table(
+                    Equipment.__tablename__, records=records, columns=IMPORT_COLUMNS
+                )
+        except Exception as exc:
+            for line in record_lines:
+                reject(line, f"Database rejected batch: {exc}")
+            continue
+        imported += len(records)
+    
+    await session.commit()
+    return EquipmentImportResult(imported=imported, rejected=rejected, errors=errors)
+
+
 @router.get("/{equipment_id}", response_model=EquipmentRead)
 async def get_equipment(
     equipment_id: uuid.UUID,
-    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_active_user),  # noqa: B008
 ):
-    """Get equipment by ID (Admin: any, User: only owned)."""
+    """
+    Get equipment by ID (Admin: any, User: only owned).
+    Answers 304 when If-None-Match carries the current ETag.
+    """
     result = await session.execute(
         select(Equipment).where(Equipment.id == equipment_id)
     )
@@ -96,6 +381,10 @@ async def get_equipment(
     if user.role != Role.ADMIN and equipment.used_by_user_id != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    etag = resource_etag(equipment.id, equipment.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return equipment
 
 
@@ -117,6 +406,16 @@ async def update_equipment(
     
     # Update only provided fields
     update_data = equipment_data.model_dump(exclude_unset=True)
+    
+    # Tickets are counted in ticket_stats under their equipment's category
+    if update_data.get("category") and update_data["category"] != equipment.category:
+        await move_equipment_category(
+            session, equipment.id, equipment.category, update_data["category"]
+        )
+        # The new category may have a preventive rule; the scheduler resolves it
+        if equipment.next_preventive_date is None:
+            equipment.next_preventive_date = date.today()
+    
     for field, value in update_data.items():
         setattr(equipment, field, value)
     
@@ -148,18 +447,31 @@ async def delete_equipment(
 
 @router.get("/my/list", response_model=list[EquipmentRead])
 async def list_my_equipment(
+    request: Request,
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(100, ge=1, le=CURSOR_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_active_user),  # noqa: B008
 ):
-    """List equipment assigned to current user."""
+    """
+    List equipment assigned to current user, newest first.
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the next one.
+    Answers 304 when If-None-Match carries the page's current ETag.
+    """
     query = (
-        select(Equipment)
+        select(*EQUIPMENT_LIST.columns(Equipment))
         .where(Equipment.used_by_user_id == user.id)
         .where(Equipment.is_scrapped == False)  # noqa: E712
-        .offset(skip)
-        .limit(limit)
     )
+    query = paginate(query, Equipment, skip, limit, cursor)
+    unchanged = await page_not_modified(request, session, query)
+    if unchanged is not None:
+        return unchanged
+    
     result = await session.execute(query)
-    return result.scalars().all()
+    equipment = result.mappings().all()
+    response = EQUIPMENT_LIST.response(equipment)
+    set_next_cursor(response, equipment, limit)
+    set_etag(response, rows_etag(equipment))
+    return response
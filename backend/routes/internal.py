@@ -0,0 +1,42 @@
+"""Internal operational routes - not part of the public API."""
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from auth.dbs import User, get_pool_status
+from auth.users import current_admin
+from metrics import render_metrics
+
+router = APIRouter(tags=["internal"], include_in_schema=False)
+
+# get_pool_status() field -> (metric name, type, help)
+POOL_GAUGES = {
+    "size": ("db_pool_size", "gauge", "Configured pool size."),
+    "checked_out": ("db_pool_checked_out", "gauge", "Connections currently checked out."),
+    "overflow": ("db_pool_overflow", "gauge", "Overflow connections currently open."),
+    "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+}
+
+
+def pool_metric_lines() -> list[str]:
+    status = get_pool_status()
+    lines = []
+    for field, (name, metric_type, documentation) in POOL_GAUGES.items():
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+        lines += [f'{name}{{pool="{pool}"}} {stats[field]}' for pool, stats in status.items()]
+    return lines
+
+
+@router.get("/internal/pool")
+async def get_pool_stats(
+    admin: User = Depends(current_admin),  # noqa: B008
+):
+    """Connection pool occupancy and checkout wait times for this process."""
+    return get_pool_status()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request latency, per-request SQL counts/time and pool metrics for this process."""
+    return PlainTextResponse(
+        render_metrics(pool_metric_lines()), media_type="text/plain; version=0.0.4"
+    )
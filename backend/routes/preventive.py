@@ -0,0 +1,114 @@
+"""Preventive maintenance schedule routes - Admin only."""
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.dbs import User, get_async_session
+from auth.users import current_admin
+from models import Equipment, PreventiveSchedule
+from preventive import activate_schedule, run_tick
+from schema import (
+    PreventiveRunResult,
+    PreventiveScheduleCreate,
+    PreventiveScheduleRead,
+    PreventiveScheduleUpdate,
+)
+
+router = APIRouter(prefix="/preventive-schedules", tags=["preventive-maintenance"])
+
+
+@router.get("/", response_model=list[PreventiveScheduleRead])
+async def list_schedules(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """List preventive maintenance rules (Admin only), oldest first."""
+    result = await session.execute(
+        select(PreventiveSchedule)
+        .order_by(PreventiveSchedule.created_at, PreventiveSchedule.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.post("/", response_model=PreventiveScheduleRead, status_code=status.HTTP_201_CREATED)
+async def create_schedule(
+    schedule_data: PreventiveScheduleCreate,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """
+    Create a recurrence rule for one piece of equipment or a whole category (Admin only).
+    Covered equipment without a schedule gets its first PREVENTIVE ticket on the next tick.
+    """
+    if (schedule_data.equipment_id is None) == (schedule_data.category is None):
+        raise HTTPException(status_code=400, detail="Set exactly one of equipment_id or category")
+    
+    if schedule_data.equipment_id and not await session.get(Equipment, schedule_data.equipment_id):
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    
+    schedule = PreventiveSchedule(**schedule_data.model_dump(), created_by=user.id)
+    session.add(schedule)
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail="A schedule already exists for this equipment or category"
+        ) from exc
+    
+    await activate_schedule(session, schedule)
+    await session.commit()
+    return schedule
+
+
+@router.put("/{schedule_id}", response_model=PreventiveScheduleRead)
+async def update_schedule(
+    schedule_id: uuid.UUID,
+    schedule_data: PreventiveScheduleUpdate,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """Update a rule (Admin only). A new interval applies from each item's next occurrence."""
+    schedule = await session.get(PreventiveSchedule, schedule_id)
+    
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    update_data = schedule_data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(schedule, field, value)
+    
+    await session.commit()
+    await session.refresh(schedule)
+    return schedule
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(
+    schedule_id: uuid.UUID,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """Delete a rule (Admin only). Open tickets it generated are kept."""
+    schedule = await session.get(PreventiveSchedule, schedule_id)
+    
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    await session.delete(schedule)
+    await session.commit()
+
+
+@router.post("/run", response_model=PreventiveRunResult)
+async def run_schedules_now(
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """Run a scheduler tick now instead of waiting for the next one (Admin only)."""
+    return await run_tick()
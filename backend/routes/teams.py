@@ -3,12 +3,14 @@ import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dbs import User, get_async_session
 from auth.users import current_admin
 from models import MaintenanceTeam, MaintenanceTeamMember
 from schema import MaintenanceTeamCreate, MaintenanceTeamRead
+from team_cache import notify_team_change, team_cache
 
 router = APIRouter(prefix="/teams", tags=["maintenance-teams"])
 
@@ -19,13 +21,11 @@ router = APIRouter(prefix="/teams", tags=["maintenance-teams"])
 async def list_teams(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_admin),  # noqa: B008
 ):
-    """List all maintenance teams (Admin only)."""
-    query = select(MaintenanceTeam).offset(skip).limit(limit)
-    result = await session.execute(query)
-    return result.scalars().all()
+    """List all maintenance teams (Admin only). Served from the team cache."""
+    await team_cache.ensure_loaded()
+    return team_cache.list_teams()[skip:skip + limit]
 
 
 @router.post("/", response_model=MaintenanceTeamRead, status_code=status.HTTP_201_CREATED)
@@ -44,22 +44,22 @@ async def create_team(
     
     team = MaintenanceTeam(**team_data.model_dump())
     session.add(team)
+    await session.flush()
+    await notify_team_change(session, team.id)
     await session.commit()
     await session.refresh(team)
+    team_cache.put_team(team)
     return team
 
 
 @router.get("/{team_id}", response_model=MaintenanceTeamRead)
 async def get_team(
     team_id: uuid.UUID,
-    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_admin),  # noqa: B008
 ):
-    """Get team by ID (Admin only)."""
-    result = await session.execute(
-        select(MaintenanceTeam).where(MaintenanceTeam.id == team_id)
-    )
-    team = result.scalar_one_or_none()
+    """Get team by ID (Admin only). Served from the team cache."""
+    await team_cache.ensure_loaded()
+    team = team_cache.get_team(team_id)
     
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -83,7 +83,9 @@ async def delete_team(
         raise HTTPException(status_code=404, detail="Team not found")
     
     await session.delete(team)
+    await notify_team_change(session, team_id)
     await session.commit()
+    team_cache.drop_team(team_id)
 
 
 # ============ Team Members ============
@@ -97,21 +99,14 @@ async def add_member_to_team(
     user: User = Depends(current_admin),  # noqa: B008
 ):
     """Add a user as member of a team (Admin only)."""
+    await team_cache.ensure_loaded()
+    
     # Verify team exists
-    team_result = await session.execute(
-        select(MaintenanceTeam).where(MaintenanceTeam.id == team_id)
-    )
-    if not team_result.scalar_one_or_none():
+    if not team_cache.get_team(team_id):
         raise HTTPException(status_code=404, detail="Team not found")
     
     # Check if already a member
-    existing = await session.execute(
-        select(MaintenanceTeamMember).where(
-            MaintenanceTeamMember.team_id == team_id,
-            MaintenanceTeamMember.user_id == user_id
-        )
-    )
-    if existing.scalar_one_or_none():
+    if team_cache.is_member(team_id, user_id):
         raise HTTPException(status_code=400, detail="User is already a member of this team")
     
     member = MaintenanceTeamMember(
@@ -120,7 +115,16 @@ async def add_member_to_team(
         role=role
     )
     session.add(member)
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        # Another replica changed the team before our cache heard about it
+        raise HTTPException(
+            status_code=400, detail="User is already a member of this team or team was deleted"
+        ) from exc
+    await notify_team_change(session, team_id)
     await session.commit()
+    team_cache.put_member(member)
     
     return {"message": "Member added", "user_id": str(user_id), "team_id": str(team_id)}
 
@@ -128,12 +132,9 @@ async def add_member_to_team(
 @router.get("/{team_id}/members")
 async def list_team_members(
     team_id: uuid.UUID,
-    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_admin),  # noqa: B008
 ):
-    """List members of a team (Admin only)."""
-    result = await session.execute(
-        select(MaintenanceTeamMember).where(MaintenanceTeamMember.team_id == team_id)
-    )
-    members = result.scalars().all()
-    return [{"user_id": str(m.user_id), "role": m.role} for m in members]
+    """List members of a team (Admin only). Served from the team cache."""
+    await team_cache.ensure_loaded()
+    members = team_cache.members.get(team_id, {})
+    return [{"user_id": str(user_id), "role": role} for user_id, role in members.items()]
@@ -1,39 +1,100 @@
 """Maintenance request routes - User creates, Admin manages full lifecycle."""
 import uuid
-from datetime import date, datetime
-from typing import Optional
+from collections import Counter
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Date,
+    Select,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import JSON, REAL, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth.dbs import Role, User, get_async_session
+from auth.dbs import (
+    Role,
+    User,
+    get_async_session,
+    get_read_session,
+    read_session_maker_for,
+)
 from auth.users import current_active_user, current_admin
-from models import Equipment, MaintenanceRequest, MaintenanceRequestStatus
+from conditional import (
+    etag_matches,
+    not_modified,
+    page_not_modified,
+    resource_etag,
+    rows_etag,
+    set_etag,
+)
+from export import ExportFormat, export_response
+from loader import EntityLoader, get_loader
+from models import (
+    TICKET_SEARCH_CONFIG,
+    Equipment,
+    MaintenanceRequest,
+    MaintenanceRequestStatus,
+    ticket_archive,
+)
+from pagination import (
+    CURSOR_PAGE_LIMIT,
+    paginate,
+    paginate_ranked,
+    set_next_cursor,
+    set_next_ranked_cursor,
+)
 from schema import (
+    CalendarDay,
+    CalendarTicket,
     MaintenanceRequestAdminCreate,
     MaintenanceRequestAdminUpdate,
+    MaintenanceRequestBulkResult,
     MaintenanceRequestRead,
     MaintenanceRequestUserCreate,
 )
+from serialization import ListEncoder
+from technician_load import AssignmentBatch, load_key, move_on_commit, technician_load
+from ticket_feed import Subscription, event_payload, notify_ticket_changes, ticket_feed
+from ticket_stats import record_ticket_stats, stat_key
 
 router = APIRouter(prefix="/tickets", tags=["maintenance-tickets"])
 
+BULK_TICKET_LIMIT = 500
+SEARCH_PAGE_LIMIT = 100
+# Widest calendar range: a six-week month grid
+CALENDAR_MAX_DAYS = 42
+
+TICKET_LIST = ListEncoder(MaintenanceRequestRead)
+
+# Fields a non-admin may not set on a bulk item
+ADMIN_ONLY_FIELDS = set(MaintenanceRequestAdminCreate.model_fields) - set(
+    MaintenanceRequestUserCreate.model_fields
+)
+
 
 # ============ Auto-fill Logic ============
 
 async def auto_fill_from_equipment(
-    session: AsyncSession, equipment_id: uuid.UUID
+    loader: EntityLoader, equipment_id: uuid.UUID
 ) -> dict:
     """
     Auto-fill maintenance_team_id, assigned_user_id, company from equipment.
     This is the CRITICAL auto-fill logic mentioned in the plan.
     """
-    result = await session.execute(
-        select(Equipment).where(Equipment.id == equipment_id)
-    )
-    equipment = result.scalar_one_or_none()
-    
+    return auto_fill_values(await loader.load(Equipment, equipment_id))
+
+
+def auto_fill_values(equipment: Optional[Equipment]) -> dict:
+    """Apply the auto-fill rules to an already loaded equipment row."""
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     
@@ -44,27 +105,48 @@ async def auto_fill_from_equipment(
         "maintenance_team_id": equipment.maintenance_team_id,
         "assigned_user_id": equipment.default_technician_id,
         "company": equipment.company,
+        "category": equipment.category,
     }
 
 
+# ============ Archive-aware Listing ============
+
+def ticket_page(
+    build: Callable[[Any], Select], include_archived: bool, skip: int, limit: int, cursor: Optional[str]
+) -> Select:
+    """
+    The paginated ticket list query. `build(source)` returns the filtered ticket select over
+    `source`: the MaintenanceRequest entity, or the columns of the archive table.
+    With include_archived, each table is paged on its own index and the two pages are
+    merged, so history costs one more index seek rather than a scan of the archive.
+    """
+    if not include_archived:
+        return paginate(build(MaintenanceRequest), MaintenanceRequest, skip, limit, cursor)
+    window = skip + limit
+    merged = union_all(
+        paginate(build(MaintenanceRequest), MaintenanceRequest, 0, window, cursor),
+        paginate(build(ticket_archive.c), ticket_archive.c, 0, window, cursor),
+    ).subquery("tickets")
+    return paginate(select(merged), merged.c, skip, limit, cursor)
+
+
 # ============ User Routes ============
 
 @router.post("/", response_model=MaintenanceRequestRead, status_code=status.HTTP_201_CREATED)
 async def create_ticket(
     ticket_data: MaintenanceRequestUserCreate,
     session: AsyncSession = Depends(get_async_session),
+    loader: EntityLoader = Depends(get_loader),
     user: User = Depends(current_active_user),  # noqa: B008
 ):
     """
     User creates a ticket for their equipment.
-    Auto-fills: maintenance_team_id, assigned_user_id, company from equipment.
+    Auto-fills: maintenance_team_id, company from equipment; assigned_user_id is the
+    team's least-loaded technician (else the equipment's default technician).
     Status defaults to NEW.
     """
     # Verify user owns this equipment
-    result = await session.execute(
-        select(Equipment).where(Equipment.id == ticket_data.equipment_id)
-    )
-    equipment = result.scalar_one_or_none()
+    equipment = await loader.load(Equipment, ticket_data.equipment_id)
     
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
@@ -76,8 +158,8 @@ async def create_ticket(
             detail="You can only create tickets for equipment assigned to you"
         )
     
-    # Auto-fill from equipment
-    auto_filled = await auto_fill_from_equipment(session, ticket_data.equipment_id)
+    # Auto-fill from equipment (already loaded above, no second query)
+    auto_filled = await auto_fill_from_equipment(loader, ticket_data.equipment_id)
     
     # Validate maintenance team exists
     if not auto_filled["maintenance_team_id"]:
@@ -86,80 +168,426 @@ async def create_ticket(
             detail="Equipment has no maintenance team assigned"
         )
     
+    await technician_load.ensure_loaded()
     ticket = MaintenanceRequest(
         subject=ticket_data.subject,
         description=ticket_data.description,
         equipment_id=ticket_data.equipment_id,
         request_type=ticket_data.request_type,
         maintenance_team_id=auto_filled["maintenance_team_id"],
-        assigned_user_id=auto_filled["assigned_user_id"],
+        assigned_user_id=technician_load.assign(
+            auto_filled["maintenance_team_id"], auto_filled["assigned_user_id"]
+        ),
         company=auto_filled["company"],
         created_by=user.id,
         status=MaintenanceRequestStatus.NEW,
     )
+    move_on_commit(session, None, load_key(ticket.maintenance_team_id, ticket.assigned_user_id, ticket.status))
     
     session.add(ticket)
+    await session.flush()
+    await record_ticket_stats(session, Counter({stat_key(ticket, equipment.category): 1}))
+    await notify_ticket_changes(session, [event_payload("created", ticket)])
     await session.commit()
-    await session.refresh(ticket)
+    # All columns are filled client-side, so no refresh round trip is needed
     return ticket
 
 
 @router.get("/my", response_model=list[MaintenanceRequestRead])
 async def list_my_tickets(
+    request: Request,
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    limit: int = Query(100, ge=1, le=CURSOR_PAGE_LIMIT),
+    cursor: Optional[str] = None,
     status_filter: Optional[MaintenanceRequestStatus] = None,
-    session: AsyncSession = Depends(get_async_session),
+    include_archived: bool = False,
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_active_user),  # noqa: B008
 ):
-    """List tickets created by current user."""
-    query = select(MaintenanceRequest).where(MaintenanceRequest.created_by == user.id)
+    """
+    List tickets created by current user; `include_archived` adds archived closed tickets.
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the next one.
+    Answers 304 when If-None-Match carries the page's current ETag.
+    """
+    def build(source) -> Select:
+        query = select(*TICKET_LIST.columns(source)).where(source.created_by == user.id)
+        if status_filter:
+            query = query.where(source.status == status_filter)
+        return query
     
-    if status_filter:
-        query = query.where(MaintenanceRequest.status == status_filter)
+    query = ticket_page(build, include_archived, skip, limit, cursor)
+    unchanged = await page_not_modified(request, session, query)
+    if unchanged is not None:
+        return unchanged
     
-    query = query.order_by(MaintenanceRequest.created_at.desc()).offset(skip).limit(limit)
     result = await session.execute(query)
-    return result.scalars().all()
+    tickets = result.mappings().all()
+    response = TICKET_LIST.response(tickets)
+    set_next_cursor(response, tickets, limit)
+    set_etag(response, rows_etag(tickets))
+    return response
+
+
+def build_bulk_ticket(
+    item: MaintenanceRequestAdminCreate,
+    equipment: Optional[Equipment],
+    user: User,
+    assignments: AssignmentBatch,
+) -> dict:
+    """
+    Validate one bulk item against its preloaded equipment and return the row to insert.
+    Applies the same rules as create_ticket (users) and admin_create_ticket (admins),
+    including least-loaded technician assignment (spread over the request's items).
+    """
+    is_admin = user.role == Role.ADMIN
+    
+    if not is_admin:
+        admin_fields = item.model_fields_set & ADMIN_ONLY_FIELDS
+        if admin_fields:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Only admins can set: {', '.join(sorted(admin_fields))}"
+            )
+        if equipment and equipment.used_by_user_id != user.id:
+            raise HTTPException(
+                status_code=403,
+                detail="You can only create tickets for equipment assigned to you"
+            )
+    
+    auto_filled = auto_fill_values(equipment)
+    
+    if is_admin:
+        row = {
+            "status": item.status,
+            "priority": item.priority,
+            "scheduled_date": item.scheduled_date,
+            "maintenance_team_id": item.maintenance_team_id or auto_filled["maintenance_team_id"],
+            "assigned_user_id": item.assigned_user_id,
+        }
+    else:
+        row = {
+            "status": MaintenanceRequestStatus.NEW,
+            "maintenance_team_id": auto_filled["maintenance_team_id"],
+            "assigned_user_id": None,
+        }
+    
+    if not row["maintenance_team_id"]:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "maintenance_team_id required (equipment has no team assigned)"
+                if is_admin else "Equipment has no maintenance team assigned"
+            )
+        )
+    
+    if not row["assigned_user_id"]:
+        row["assigned_user_id"] = assignments.assign(
+            row["maintenance_team_id"], auto_filled["assigned_user_id"]
+        )
+    
+    row.update(
+        subject=item.subject,
+        description=item.description,
+        equipment_id=item.equipment_id,
+        request_type=item.request_type,
+        company=auto_filled["company"],
+        created_by=user.id,
+    )
+    return row
+
+
+@router.post("/bulk", response_model=list[MaintenanceRequestBulkResult])
+async def bulk_create_tickets(
+    items: list[MaintenanceRequestAdminCreate],
+    session: AsyncSession = Depends(get_async_session),
+    loader: EntityLoader = Depends(get_loader),
+    user: User = Depends(current_active_user),  # noqa: B008
+):
+    """
+    Create many tickets in one request.
+    Users send the same fields as POST /tickets/, admins may also send the POST /tickets/admin fields.
+    All equipment is loaded with one query and valid items are inserted with one
+    multi-row INSERT ... RETURNING; invalid items are reported per index and skipped.
+    """
+    if len(items) > BULK_TICKET_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BULK_TICKET_LIMIT} tickets per request"
+        )
+    if not items:
+        return []
+    
+    equipment_by_id = await loader.load_many(Equipment, (item.equipment_id for item in items))
+    await technician_load.ensure_loaded()
+    assignments = technician_load.batch()
+    
+    results: list[Optional[MaintenanceRequestBulkResult]] = [None] * len(items)
+    rows = []
+    row_indexes = []
+    for index, item in enumerate(items):
+        try:
+            row = build_bulk_ticket(item, equipment_by_id.get(item.equipment_id), user, assignments)
+        except HTTPException as exc:
+            results[index] = MaintenanceRequestBulkResult(index=index, error=exc.detail)
+            continue
+        move_on_commit(session, None, load_key(row["maintenance_team_id"], row["assigned_user_id"], row["status"]))
+        rows.append(row)
+        row_indexes.append(index)
+    
+    if rows:
+        tickets = await session.scalars(
+            insert(MaintenanceRequest).returning(MaintenanceRequest, sort_by_parameter_order=True),
+            rows,
+        )
+        tickets = tickets.all()
+        deltas = Counter()
+        for index, ticket in zip(row_indexes, tickets, strict=True):
+            results[index] = MaintenanceRequestBulkResult(
+                index=index, ticket=MaintenanceRequestRead.model_validate(ticket)
+            )
+            deltas[stat_key(ticket, equipment_by_id[ticket.equipment_id].category)] += 1
+        await record_ticket_stats(session, deltas)
+        await notify_ticket_changes(session, (event_payload("created", ticket) for ticket in tickets))
+        await session.commit()
+    
+    return results
 
 
 # ============ Admin Routes ============
 
+def filter_tickets(
+    query: Select,
+    status_filter: Optional[MaintenanceRequestStatus],
+    equipment_id: Optional[uuid.UUID],
+    team_id: Optional[uuid.UUID],
+    source: Any = MaintenanceRequest,
+) -> Select:
+    """Apply the optional admin list filters to a ticket query over `source` (see ticket_page)."""
+    if status_filter:
+        query = query.where(source.status == status_filter)
+    if equipment_id:
+        query = query.where(source.equipment_id == equipment_id)
+    if team_id:
+        query = query.where(source.maintenance_team_id == team_id)
+    return query
+
+
 @router.get("/", response_model=list[MaintenanceRequestRead])
 async def list_all_tickets(
+    request: Request,
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    limit: int = Query(100, ge=1, le=CURSOR_PAGE_LIMIT),
+    cursor: Optional[str] = None,
     status_filter: Optional[MaintenanceRequestStatus] = None,
     equipment_id: Optional[uuid.UUID] = None,
     team_id: Optional[uuid.UUID] = None,
-    session: AsyncSession = Depends(get_async_session),
+    include_archived: bool = False,
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_admin),  # noqa: B008
 ):
-    """List all tickets (Admin only) with optional filters."""
-    query = select(MaintenanceRequest)
+    """
+    List all tickets (Admin only) with optional filters; `include_archived` adds archived closed tickets.
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the next one.
+    Answers 304 when If-None-Match carries the page's current ETag.
+    """
+    def build(source) -> Select:
+        return filter_tickets(
+            select(*TICKET_LIST.columns(source)), status_filter, equipment_id, team_id, source
+        )
     
-    if status_filter:
-        query = query.where(MaintenanceRequest.status == status_filter)
-    if equipment_id:
-        query = query.where(MaintenanceRequest.equipment_id == equipment_id)
-    if team_id:
-        query = query.where(MaintenanceRequest.maintenance_team_id == team_id)
+    query = ticket_page(build, include_archived, skip, limit, cursor)
+    unchanged = await page_not_modified(request, session, query)
+    if unchanged is not None:
+        return unchanged
     
-    query = query.order_by(MaintenanceRequest.created_at.desc()).offset(skip).limit(limit)
     result = await session.execute(query)
-    return result.scalars().all()
+    tickets = result.mappings().all()
+    response = TICKET_LIST.response(tickets)
+    set_next_cursor(response, tickets, limit)
+    set_etag(response, rows_etag(tickets))
+    return response
+
+
+@router.get("/export")
+async def export_tickets(
+    request: Request,
+    file_format: ExportFormat = Query("ndjson", alias="format"),
+    status_filter: Optional[MaintenanceRequestStatus] = None,
+    equipment_id: Optional[uuid.UUID] = None,
+    team_id: Optional[uuid.UUID] = None,
+    user: User = Depends(current_admin),  # noqa: B008
+):
+    """
+    Stream all tickets matching the list filters as NDJSON or CSV (Admin only).
+    Rows are read through a server-side cursor, so memory stays flat for any export size.
+    """
+    query = filter_tickets(select(MaintenanceRequest), status_filter, equipment_id, team_id)
+    query = query.order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id.desc())
+    return export_response(query, MaintenanceRequestRead, file_format, "tickets", read_session_maker_for(request))
+
+
+# ============ Search ============
+
+def ticket_search(q: str):
+    """The GIN-indexable match condition and the ts_rank expression for a web-search style query."""
+    ts_query = func.websearch_to_tsquery(literal_column(f"'{TICKET_SEARCH_CONFIG}'::regconfig"), q)
+    match = MaintenanceRequest.search_vector.bool_op("@@")(ts_query)
+    rank = func.ts_rank(MaintenanceRequest.search_vector, ts_query, type_=REAL)
+    return match, rank
+
+
+@router.get("/search", response_model=list[MaintenanceRequestRead])
+async def search_tickets(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=SEARCH_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    status_filter: Optional[MaintenanceRequestStatus] = None,
+    equipment_id: Optional[uuid.UUID] = None,
+    team_id: Optional[uuid.UUID] = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_active_user),  # noqa: B008
+):
+    """
+    Full-text search over ticket subject (ranked higher) and description, best matches first.
+    `q` takes web-search syntax: "quoted phrase", OR, -excluded. Users only search their own tickets.
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the next one.
+    """
+    match, rank = ticket_search(q)
+    query = filter_tickets(
+        select(MaintenanceRequest, rank).where(match), status_filter, equipment_id, team_id
+    )
+    if user.role != Role.ADMIN:
+        query = query.where(MaintenanceRequest.created_by == user.id)
+    
+    query = paginate_ranked(query, MaintenanceRequest, rank, limit, cursor)
+    rows = (await session.execute(query)).all()
+    set_next_ranked_cursor(response, rows, limit)
+    return [ticket for ticket, _ in rows]
+
+
+# ============ Calendar ============
+
+def calendar_query(start: date, end: date) -> Select:
+    """
+    Tickets scheduled from `start` to `end` (inclusive) as CalendarTicket columns, with their
+    date_trunc day and their position within it. The range is an index range scan on scheduled_date.
+    """
+    day = func.date_trunc(literal_column("'day'"), MaintenanceRequest.scheduled_date)
+    return (
+        select(
+            day.label("day"),
+            *(getattr(MaintenanceRequest, name) for name in CalendarTicket.model_fields),
+            func.row_number().over(
+                partition_by=day, order_by=(MaintenanceRequest.scheduled_date, MaintenanceRequest.id)
+            ).label("position"),
+        )
+        .where(MaintenanceRequest.scheduled_date >= datetime.combine(start, time()))
+        .where(MaintenanceRequest.scheduled_date < datetime.combine(end + timedelta(days=1), time()))
+    )
+
+
+def calendar_buckets(scheduled: Select, per_day: int) -> Select:
+    """Group the rows of calendar_query per day, summarizing the first `per_day` of each."""
+    rows = scheduled.subquery("scheduled")
+    summary = func.json_build_object(
+        *(part for name in CalendarTicket.model_fields for part in (literal_column(f"'{name}'"), rows.c[name]))
+    )
+    return (
+        select(
+            cast(rows.c.day, Date).label("day"),
+            func.count().label("count"),
+            func.coalesce(
+                func.json_agg(aggregate_order_by(summary, rows.c.position), type_=JSON)
+                .filter(rows.c.position <= per_day),
+                literal_column("'[]'::json"),
+            ).label("tickets"),
+        )
+        .group_by(rows.c.day)
+        .order_by(rows.c.day)
+    )
+
+
+@router.get("/calendar", response_model=list[CalendarDay])
+async def ticket_calendar(
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    team_id: Optional[uuid.UUID] = None,
+    per_day: int = Query(20, ge=0, le=100),
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_active_user),  # noqa: B008
+):
+    """
+    Scheduled tickets from `from` to `to` (inclusive), bucketed per day, for calendar views.
+    Each day carries its ticket count and up to `per_day` summaries; days without tickets are omitted.
+    Users only see their own tickets, as in /tickets/my.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end - start).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Calendar range is limited to {CALENDAR_MAX_DAYS} days")
+    
+    scheduled = calendar_query(start, end)
+    if team_id:
+        scheduled = scheduled.where(MaintenanceRequest.maintenance_team_id == team_id)
+    if user.role != Role.ADMIN:
+        scheduled = scheduled.where(MaintenanceRequest.created_by == user.id)
+    
+    result = await session.execute(calendar_buckets(scheduled, per_day))
+    return result.mappings().all()
+
+
+# ============ Live Feed ============
+
+@router.get("/events", response_class=StreamingResponse)
+async def ticket_events(
+    team_id: Optional[list[uuid.UUID]] = Query(None),
+    assigned_user_id: Optional[uuid.UUID] = None,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),  # noqa: B008
+):
+    """
+    Server-sent events for ticket creates, updates and deletes as they commit.
+    Filter by `team_id` (repeatable) and `assigned_user_id`; users only receive their own tickets.
+    A `resync` event means events were dropped and the client should refetch.
+    """
+    # The auth dependencies share this session; release its connection for the stream's lifetime
+    await session.close()
+    
+    subscription = Subscription(
+        team_ids=frozenset(str(team) for team in team_id) if team_id else None,
+        created_by=None if user.role == Role.ADMIN else str(user.id),
+        assigned_user_id=str(assigned_user_id) if assigned_user_id else None,
+    )
+    return StreamingResponse(
+        ticket_feed.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/admin", response_model=MaintenanceRequestRead, status_code=status.HTTP_201_CREATED)
 async def admin_create_ticket(
     ticket_data: MaintenanceRequestAdminCreate,
     session: AsyncSession = Depends(get_async_session),
+    loader: EntityLoader = Depends(get_loader),
     user: User = Depends(current_admin),  # noqa: B008
 ):
-    """Admin creates a ticket with full control over all fields."""
+    """
+    Admin creates a ticket with full control over all fields.
+    Without assigned_user_id, the team's least-loaded technician is assigned.
+    """
     # Get auto-fill values but admin can override
-    auto_filled = await auto_fill_from_equipment(session, ticket_data.equipment_id)
+    auto_filled = await auto_fill_from_equipment(loader, ticket_data.equipment_id)
+    team_id = ticket_data.maintenance_team_id or auto_filled["maintenance_team_id"]
+    
+    if not team_id:
+        raise HTTPException(
+            status_code=400,
+            detail="maintenance_team_id required (equipment has no team assigned)"
+        )
     
+    await technician_load.ensure_loaded()
     ticket = MaintenanceRequest(
         subject=ticket_data.subject,
         description=ticket_data.description,
@@ -169,36 +597,46 @@ async def admin_create_ticket(
         priority=ticket_data.priority,
         scheduled_date=ticket_data.scheduled_date,
         # Use provided values or fall back to auto-fill
-        maintenance_team_id=ticket_data.maintenance_team_id or auto_filled["maintenance_team_id"],
-        assigned_user_id=ticket_data.assigned_user_id or auto_filled["assigned_user_id"],
+        maintenance_team_id=team_id,
+        assigned_user_id=(
+            ticket_data.assigned_user_id or technician_load.assign(team_id, auto_filled["assigned_user_id"])
+        ),
         company=auto_filled["company"],
         created_by=user.id,
     )
-    
-    if not ticket.maintenance_team_id:
-        raise HTTPException(
-            status_code=400,
-            detail="maintenance_team_id required (equipment has no team assigned)"
-        )
+    move_on_commit(session, None, load_key(ticket.maintenance_team_id, ticket.assigned_user_id, ticket.status))
     
     session.add(ticket)
+    await session.flush()
+    await record_ticket_stats(session, Counter({stat_key(ticket, auto_filled["category"]): 1}))
+    await notify_ticket_changes(session, [event_payload("created", ticket)])
     await session.commit()
-    await session.refresh(ticket)
     return ticket
 
 
 @router.get("/{ticket_id}", response_model=MaintenanceRequestRead)
 async def get_ticket(
     ticket_id: uuid.UUID,
-    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    include_archived: bool = False,
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_active_user),  # noqa: B008
 ):
-    """Get ticket by ID (Admin: any, User: only their own)."""
+    """
+    Get ticket by ID (Admin: any, User: only their own).
+    With `include_archived`, a ticket missing from the live table is looked up in the archive.
+    Answers 304 when If-None-Match carries the current ETag.
+    """
     result = await session.execute(
         select(MaintenanceRequest).where(MaintenanceRequest.id == ticket_id)
     )
     ticket = result.scalar_one_or_none()
     
+    if not ticket and include_archived:
+        result = await session.execute(select(ticket_archive).where(ticket_archive.c.id == ticket_id))
+        ticket = result.first()
+    
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
@@ -206,6 +644,10 @@ async def get_ticket(
     if user.role != Role.ADMIN and ticket.created_by != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    etag = resource_etag(ticket.id, ticket.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return ticket
 
 
@@ -214,28 +656,41 @@ async def update_ticket(
     ticket_id: uuid.UUID,
     ticket_data: MaintenanceRequestAdminUpdate,
     session: AsyncSession = Depends(get_async_session),
+    loader: EntityLoader = Depends(get_loader),
     user: User = Depends(current_admin),  # noqa: B008
 ):
     """
     Admin updates ticket (full control).
     Handles status transitions and scrap logic.
     """
+    # Lock the row: the ticket_stats deltas below are computed from its old state
     result = await session.execute(
-        select(MaintenanceRequest).where(MaintenanceRequest.id == ticket_id)
+        select(MaintenanceRequest, Equipment.category)
+        .join(Equipment, Equipment.id == MaintenanceRequest.equipment_id)
+        .where(MaintenanceRequest.id == ticket_id)
+        .with_for_update(of=MaintenanceRequest)
     )
-    ticket = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not ticket:
+    if not row:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
+    ticket, category = row
+    old_key = stat_key(ticket, category)
+    old_team_id = ticket.maintenance_team_id
+    old_load = load_key(ticket.maintenance_team_id, ticket.assigned_user_id, ticket.status)
     update_data = ticket_data.model_dump(exclude_unset=True)
     
+    # Moving the ticket to other equipment may change its stats category
+    if "equipment_id" in update_data and update_data["equipment_id"] != ticket.equipment_id:
+        new_equipment = await loader.load(Equipment, update_data["equipment_id"])
+        if not new_equipment:
+            raise HTTPException(status_code=404, detail="Equipment not found")
+        category = new_equipment.category
+    
     # Handle SCRAP status - mark equipment as scrapped
     if update_data.get("status") == MaintenanceRequestStatus.SCRAP:
-        equipment_result = await session.execute(
-            select(Equipment).where(Equipment.id == ticket.equipment_id)
-        )
-        equipment = equipment_result.scalar_one_or_none()
+        equipment = await loader.load(Equipment, ticket.equipment_id)
         if equipment:
             equipment.is_scrapped = True
             equipment.scrap_date = date.today()
@@ -248,6 +703,15 @@ async def update_ticket(
     for field, value in update_data.items():
         setattr(ticket, field, value)
     
+    # Keep ticket_stats in step with status / team / equipment changes
+    new_key = stat_key(ticket, category)
+    if new_key != old_key:
+        await record_ticket_stats(session, Counter({old_key: -1, new_key: 1}))
+    move_on_commit(session, old_load, load_key(ticket.maintenance_team_id, ticket.assigned_user_id, ticket.status))
+    
+    # Flush first so the event carries the new updated_at
+    await session.flush()
+    await notify_ticket_changes(session, [event_payload("updated", ticket, old_team_id)])
     await session.commit()
     await session.refresh(ticket)
     return ticket
@@ -260,13 +724,21 @@ async def delete_ticket(
     user: User = Depends(current_admin),  # noqa: B008
 ):
     """Delete a ticket (Admin only)."""
+    # Lock the row, so concurrent deletes decrement ticket_stats once (the others get 404)
     result = await session.execute(
-        select(MaintenanceRequest).where(MaintenanceRequest.id == ticket_id)
+        select(MaintenanceRequest, Equipment.category)
+        .join(Equipment, Equipment.id == MaintenanceRequest.equipment_id)
+        .where(MaintenanceRequest.id == ticket_id)
+        .with_for_update(of=MaintenanceRequest)
     )
-    ticket = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not ticket:
+    if not row:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
+    ticket, category = row
     await session.delete(ticket)
+    await record_ticket_stats(session, Counter({stat_key(ticket, category): -1}))
+    move_on_commit(session, load_key(ticket.maintenance_team_id, ticket.assigned_user_id, ticket.status), None)
+    await notify_ticket_changes(session, [event_payload("deleted", ticket)])
     await session.commit()
@@ -3,7 +3,7 @@ import uuid
 from datetime import date, datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from models import EquipmentUsedByType, MaintenanceRequestStatus, MaintenanceRequestType
 
@@ -72,6 +72,7 @@ class EquipmentRead(EquipmentBase):
     default_technician_id: Optional[uuid.UUID] = None
     assigned_date: Optional[date] = None
     scrap_date: Optional[date] = None
+    next_preventive_date: Optional[date] = None
     is_scrapped: bool
     created_at: datetime
     updated_at: datetime
@@ -79,6 +80,32 @@ class EquipmentRead(EquipmentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EquipmentSearchResult(BaseModel):
+    """Equipment typeahead match; similarity is pg_trgm word_similarity (0-1)."""
+    id: uuid.UUID
+    name: str
+    category: str
+    used_in_location: Optional[str] = None
+    work_center: Optional[str] = None
+    maintenance_team_id: Optional[uuid.UUID] = None
+    similarity: float
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EquipmentImportError(BaseModel):
+    """A rejected line of an equipment import file."""
+    line: int
+    error: str
+
+
+class EquipmentImportResult(BaseModel):
+    """Summary of an equipment import; errors are capped, rejected is the full count."""
+    imported: int
+    rejected: int
+    errors: list[EquipmentImportError]
+
+
 # ============ Maintenance Request Schemas ============
 
 class MaintenanceRequestBase(BaseModel):
@@ -136,3 +163,91 @@ class MaintenanceRequestRead(MaintenanceRequestBase):
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class MaintenanceRequestBulkResult(BaseModel):
+    """Outcome of one item of POST /tickets/bulk: the created ticket or why it was rejected."""
+    index: int
+    ticket: Optional[MaintenanceRequestRead] = None
+    error: Optional[str] = None
+
+
+class CalendarTicket(BaseModel):
+    """Compact ticket summary placed on a calendar day."""
+    id: uuid.UUID
+    subject: str
+    request_type: MaintenanceRequestType
+    status: MaintenanceRequestStatus
+    priority: int
+    scheduled_date: datetime
+    equipment_id: uuid.UUID
+    maintenance_team_id: uuid.UUID
+    assigned_user_id: Optional[uuid.UUID] = None
+
+
+class CalendarDay(BaseModel):
+    """Tickets scheduled on one day: the full count and the earliest `per_day` summaries."""
+    day: date
+    count: int
+    tickets: list[CalendarTicket]
+
+
+# ============ Preventive Maintenance Schemas ============
+
+class PreventiveScheduleCreate(BaseModel):
+    """Recurrence rule - set exactly one of equipment_id or category."""
+    equipment_id: Optional[uuid.UUID] = None
+    category: Optional[str] = None
+    interval_days: int = Field(ge=1)
+    subject: str = "Preventive maintenance"
+    description: Optional[str] = None
+
+
+class PreventiveScheduleUpdate(BaseModel):
+    """Change the recurrence or the ticket template; the target is fixed."""
+    interval_days: Optional[int] = Field(None, ge=1)
+    subject: Optional[str] = None
+    description: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def reject_nulls(self):
+        # May be left out, but not cleared: the columns are NOT NULL
+        for field in ("interval_days", "subject"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+class PreventiveScheduleRead(PreventiveScheduleCreate):
+    """Recurrence rule response."""
+    id: uuid.UUID
+    created_by: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PreventiveRunResult(BaseModel):
+    """Outcome of one scheduler tick."""
+    equipment: int
+    tickets_created: int
+
+
+# ============ Dashboard Schemas ============
+
+class TeamTicketCount(BaseModel):
+    """Number of tickets handled by one team."""
+    team_id: uuid.UUID
+    team_name: Optional[str] = None
+    count: int
+
+
+class DashboardSummary(BaseModel):
+    """Counts and recent tickets for the dashboard, scoped to the caller's role."""
+    total_tickets: int
+    tickets_by_status: dict[MaintenanceRequestStatus, int]
+    tickets_by_team: list[TeamTicketCount]
+    open_equipment: int
+    scrapped_equipment: int
+    recent_tickets: list[MaintenanceRequestRead]
@@ -0,0 +1,45 @@
+"""
+Fast JSON encoding for large list responses.
+
+By default FastAPI validates every ORM entity into the response model
+(from_attributes) and then serializes the models again with the stdlib json
+encoder. List routes instead select only the response model's columns,
+validate the RowMappings in one TypeAdapter call against a TypedDict mirror of
+the model, and encode the resulting plain dicts with orjson.
+"""
+from collections.abc import Sequence
+from typing import Any, TypedDict
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import InstrumentedAttribute
+
+JSON_MEDIA_TYPE = "application/json"
+# Naive datetimes encode as-is; "Z" for UTC matches Pydantic's JSON output
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class ListEncoder:
+    """Column selection and one-pass JSON encoding for lists of `read_model`."""
+
+    def __init__(self, read_model: type[BaseModel]):
+        self.read_model = read_model
+        self.fields = list(read_model.model_fields)
+        # Same field types as the model, but validates into dicts orjson can encode directly
+        row_type = TypedDict(
+            f"{read_model.__name__}Row",
+            {name: field.annotation for name, field in read_model.model_fields.items()},
+        )
+        self.adapter = TypeAdapter(list[row_type])
+
+    def columns(self, entity) -> list[InstrumentedAttribute]:
+        """The entity columns backing every field of the read model, for select()."""
+        return [getattr(entity, name) for name in self.fields]
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        """Validate and encode RowMappings (or dicts) as a JSON array."""
+        return orjson.dumps(self.adapter.validate_python(rows), option=ORJSON_OPTIONS)
+
+    def response(self, rows: Sequence[Any]) -> Response:
+        return Response(self.encode(rows), media_type=JSON_MEDIA_TYPE)
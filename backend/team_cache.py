@@ -0,0 +1,141 @@
+"""
+In-process cache of maintenance teams and team membership.
+
+Teams and memberships change rarely but are checked on every equipment write, so
+each process keeps them in memory. The cache is warmed in lifespan, updated
+write-through by the team routes, and kept coherent across replicas with
+Postgres LISTEN/NOTIFY: every team write sends NOTIFY on TEAM_CACHE_CHANNEL in
+its transaction, and each process reloads the affected team when it hears it.
+"""
+import asyncio
+import uuid
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.dbs import async_session_maker
+from listener import listen_forever
+from models import MaintenanceTeam, MaintenanceTeamMember
+from schema import MaintenanceTeamRead
+
+TEAM_CACHE_CHANNEL = "team_cache"
+
+
+class TeamCache:
+    """Team rows by id and a team_id -> {user_id: role} membership index."""
+
+    def __init__(self):
+        self.teams: dict[uuid.UUID, MaintenanceTeamRead] = {}
+        self.members: dict[uuid.UUID, dict[uuid.UUID, str]] = {}
+        # Bumped on every membership change, so derived per-team state knows to rebuild
+        self.revision = 0
+        self.loaded = False
+        self._listener_task: Optional[asyncio.Task] = None
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    # ---- reads ----
+
+    async def ensure_loaded(self) -> None:
+        if not self.loaded:
+            await self.reload()
+
+    def get_team(self, team_id: uuid.UUID) -> Optional[MaintenanceTeamRead]:
+        return self.teams.get(team_id)
+
+    def list_teams(self) -> list[MaintenanceTeamRead]:
+        return sorted(self.teams.values(), key=lambda team: (team.created_at, team.id))
+
+    def is_member(self, team_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        return user_id in self.members.get(team_id, {})
+
+    def members_with_role(self, team_id: uuid.UUID, role: str) -> list[uuid.UUID]:
+        return [user_id for user_id, member_role in self.members.get(team_id, {}).items() if member_role == role]
+
+    def memberships(self) -> set[tuple[uuid.UUID, uuid.UUID]]:
+        return {
+            (team_id, user_id)
+            for team_id, members in self.members.items()
+            for user_id in members
+        }
+
+    # ---- write-through ----
+
+    def put_team(self, team: MaintenanceTeam) -> None:
+        self.teams[team.id] = MaintenanceTeamRead.model_validate(team)
+        self.members.setdefault(team.id, {})
+
+    def drop_team(self, team_id: uuid.UUID) -> None:
+        self.teams.pop(team_id, None)
+        self.members.pop(team_id, None)
+        self.revision += 1
+
+    def put_member(self, member: MaintenanceTeamMember) -> None:
+        self.members.setdefault(member.team_id, {})[member.user_id] = member.role
+        self.revision += 1
+
+    # ---- loading ----
+
+    async def reload(self) -> None:
+        """Load every team and membership (two queries)."""
+        async with async_session_maker() as session:
+            teams = (await session.execute(select(MaintenanceTeam))).scalars().all()
+            members = (await session.execute(
+                select(MaintenanceTeamMember.team_id, MaintenanceTeamMember.user_id, MaintenanceTeamMember.role)
+            )).all()
+
+        self.teams = {team.id: MaintenanceTeamRead.model_validate(team) for team in teams}
+        self.members = {team.id: {} for team in teams}
+        for team_id, user_id, role in members:
+            self.members.setdefault(team_id, {})[user_id] = role
+        self.revision += 1
+        self.loaded = True
+
+    async def reload_team(self, team_id: uuid.UUID) -> None:
+        """Reload one team and its members after another process changed them."""
+        async with async_session_maker() as session:
+            team = await session.get(MaintenanceTeam, team_id)
+            members = (await session.execute(
+                select(MaintenanceTeamMember.user_id, MaintenanceTeamMember.role)
+                .where(MaintenanceTeamMember.team_id == team_id)
+            )).all()
+
+        if team is None:
+            self.drop_team(team_id)
+            return
+        self.teams[team_id] = MaintenanceTeamRead.model_validate(team)
+        self.members[team_id] = dict(members)
+        self.revision += 1
+
+    # ---- cross-replica invalidation ----
+
+    async def start(self) -> None:
+        """Warm the cache and start listening for changes from other replicas."""
+        await self.reload()
+        # Reloads again once LISTEN is in place, catching changes made in between
+        self._listener_task = asyncio.create_task(
+            listen_forever(TEAM_CACHE_CHANNEL, self._on_notify, self.reload)
+        )
+
+    async def stop(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            team_id = uuid.UUID(payload)
+        except ValueError:
+            return
+        task = asyncio.create_task(self.reload_team(team_id))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+
+async def notify_team_change(session: AsyncSession, team_id: uuid.UUID) -> None:
+    """Tell every process to reload `team_id`; delivered when the session commits."""
+    await session.execute(select(func.pg_notify(TEAM_CACHE_CHANNEL, str(team_id))))
+
+
+team_cache = TeamCache()
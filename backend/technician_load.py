@@ -0,0 +1,222 @@
+"""
+Load-aware technician assignment.
+
+New tickets without an explicit assignee go to the team's TECHNICIAN member with
+the fewest open (NEW or IN_PROGRESS) tickets of that team. Each process keeps the
+open counts in memory, loaded with one aggregate query, and a min-heap of
+(count, user_id) per team, so a pick is O(log n) and never counts tickets.
+
+Ticket writes adjust the counts once their transaction commits (see load_key
+and move_on_commit), so a rolled-back write never counts. Count changes push
+a fresh heap entry and leave the old one behind; stale entries are skipped
+when they reach the top. Writes made by other replicas are absorbed by a
+full reload every TECHNICIAN_LOAD_REFRESH_SECONDS.
+"""
+import asyncio
+import heapq
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from auth.dbs import async_session_maker
+from models import OPEN_TICKET, MaintenanceRequest, MaintenanceRequestStatus
+from team_cache import team_cache
+
+logger = logging.getLogger(__name__)
+
+# "least_loaded", or "default_technician" to always use Equipment.default_technician_id
+TICKET_ASSIGNMENT_STRATEGY = os.getenv("TICKET_ASSIGNMENT_STRATEGY", "least_loaded")
+TECHNICIAN_LOAD_REFRESH_SECONDS = float(os.getenv("TECHNICIAN_LOAD_REFRESH_SECONDS", "60"))
+TECHNICIAN_ROLE = "TECHNICIAN"
+
+OPEN_STATUSES = frozenset({MaintenanceRequestStatus.NEW, MaintenanceRequestStatus.IN_PROGRESS})
+
+LoadKey = tuple[uuid.UUID, uuid.UUID]
+
+
+def load_key(
+    team_id: Optional[uuid.UUID], user_id: Optional[uuid.UUID], status: MaintenanceRequestStatus
+) -> Optional[LoadKey]:
+    """The (team, technician) a ticket counts against, or None if it adds no load."""
+    if team_id is None or user_id is None or status not in OPEN_STATUSES:
+        return None
+    return (team_id, user_id)
+
+
+def move_on_commit(session: AsyncSession, old: Optional[LoadKey], new: Optional[LoadKey]) -> None:
+    """Move one ticket's load (see TechnicianLoad.move) once `session` commits."""
+    if old != new:
+        session.info.setdefault("load_moves", []).append((old, new))
+
+
+@event.listens_for(Session, "after_commit")
+def _move_after_commit(session: Session) -> None:
+    for old, new in session.info.pop("load_moves", ()):
+        technician_load.move(old, new)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop("load_moves", None)
+
+
+@dataclass
+class TeamHeap:
+    """Min-heap of (open count, user_id) over one team's technicians."""
+    revision: int
+    technicians: frozenset[uuid.UUID]
+    entries: list[tuple[int, uuid.UUID]] = field(default_factory=list)
+
+
+class TechnicianLoad:
+    """Open ticket counts by (team, technician) and a lazily built heap per team."""
+
+    def __init__(self):
+        self.counts: dict[LoadKey, int] = {}
+        self.loaded = False
+        self._heaps: dict[uuid.UUID, TeamHeap] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # ---- assignment ----
+
+    async def ensure_loaded(self) -> None:
+        await team_cache.ensure_loaded()
+        if not self.loaded:
+            await self.reload()
+
+    def assign(self, team_id: uuid.UUID, fallback: Optional[uuid.UUID]) -> Optional[uuid.UUID]:
+        """
+        The technician a new ticket of `team_id` goes to. `fallback` (the equipment's
+        default technician) is used when the team has no technicians or the strategy is off.
+        """
+        if TICKET_ASSIGNMENT_STRATEGY != "least_loaded":
+            return fallback
+        return self.least_loaded(team_id) or fallback
+
+    def batch(self) -> "AssignmentBatch":
+        return AssignmentBatch(self)
+
+    def least_loaded(self, team_id: uuid.UUID) -> Optional[uuid.UUID]:
+        heap = self._heap(team_id)
+        while heap.entries:
+            count, user_id = heap.entries[0]
+            if self.counts.get((team_id, user_id), 0) == count:
+                return user_id
+            heapq.heappop(heap.entries)  # superseded by a newer entry
+        return None
+
+    # ---- incremental updates ----
+
+    def move(self, old: Optional[LoadKey], new: Optional[LoadKey]) -> None:
+        """Move one ticket's load from `old` to `new` (either may be None)."""
+        if old == new:
+            return
+        if old:
+            self._add(old, -1)
+        if new:
+            self._add(new, 1)
+
+    def _add(self, key: LoadKey, delta: int) -> None:
+        count = max(self.counts.get(key, 0) + delta, 0)
+        self.counts[key] = count
+        team_id, user_id = key
+        heap = self._heaps.get(team_id)
+        if heap and user_id in heap.technicians:
+            heapq.heappush(heap.entries, (count, user_id))
+            # Drop the superseded entries once they dominate the heap
+            if len(heap.entries) > 4 * len(heap.technicians) + 16:
+                del self._heaps[team_id]
+
+    def _heap(self, team_id: uuid.UUID) -> TeamHeap:
+        """The team's heap, rebuilt in O(n) after membership changes or compaction."""
+        heap = self._heaps.get(team_id)
+        if heap is None or heap.revision != team_cache.revision:
+            entries = self.team_entries(team_id)
+            heap = TeamHeap(
+                revision=team_cache.revision,
+                technicians=frozenset(user_id for _, user_id in entries),
+                entries=entries,
+            )
+            self._heaps[team_id] = heap
+        return heap
+
+    def team_entries(self, team_id: uuid.UUID) -> list[tuple[int, uuid.UUID]]:
+        """A fresh heap of (open count, user_id) over the team's technicians."""
+        entries = [
+            (self.counts.get((team_id, user_id), 0), user_id)
+            for user_id in team_cache.members_with_role(team_id, TECHNICIAN_ROLE)
+        ]
+        heapq.heapify(entries)
+        return entries
+
+    # ---- loading ----
+
+    async def reload(self) -> None:
+        """Recount open tickets per team and assignee (one query on idx_requests_open_assignee)."""
+        async with async_session_maker() as session:
+            rows = (await session.execute(
+                select(MaintenanceRequest.maintenance_team_id, MaintenanceRequest.assigned_user_id, func.count())
+                .where(text(OPEN_TICKET))
+                .where(MaintenanceRequest.assigned_user_id.is_not(None))
+                .group_by(MaintenanceRequest.maintenance_team_id, MaintenanceRequest.assigned_user_id)
+            )).all()
+
+        self.counts = {(team_id, user_id): count for team_id, user_id, count in rows}
+        self._heaps = {}
+        self.loaded = True
+
+    async def start(self) -> None:
+        """Load the counts and keep reloading them in the background."""
+        await self.reload()
+        self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def stop(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(TECHNICIAN_LOAD_REFRESH_SECONDS)
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Technician load reload failed")
+
+
+class AssignmentBatch:
+    """
+    Assignments for the tickets of one transaction. Each pick counts against its
+    technician for the rest of the batch, so a batch spreads over the team; the
+    shared counts only change once the batch commits (see move_on_commit).
+    """
+
+    def __init__(self, load: TechnicianLoad):
+        self._load = load
+        self._heaps: dict[uuid.UUID, list[tuple[int, uuid.UUID]]] = {}
+
+    def assign(self, team_id: uuid.UUID, fallback: Optional[uuid.UUID]) -> Optional[uuid.UUID]:
+        """Like TechnicianLoad.assign, counting this batch's earlier picks."""
+        if TICKET_ASSIGNMENT_STRATEGY != "least_loaded":
+            return fallback
+        heap = self._heaps.get(team_id)
+        if heap is None:
+            heap = self._heaps[team_id] = self._load.team_entries(team_id)
+        if not heap:
+            return fallback
+        count, user_id = heap[0]
+        heapq.heapreplace(heap, (count + 1, user_id))
+        return user_id
+
+
+technician_load = TechnicianLoad()
@@ -0,0 +1,174 @@
+"""
+Fixtures for the performance suite.
+
+The suite needs a disposable Postgres database: set PERF_DATABASE_URL to it
+(the database name must end in _perf or _test, since every table is dropped
+and recreated). Without it, every test is skipped. The data comes from the same
+generator as commands.seed, so budgets are measured on the seed tool's data shape.
+"""
+import asyncio
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from sqlalchemy import make_url
+
+PERF_DATABASE_URL = os.environ.get("PERF_DATABASE_URL")
+if PERF_DATABASE_URL:
+    # auth.dbs reads these at import time
+    os.environ["DATABASE_URL"] = PERF_DATABASE_URL
+    os.environ.pop("DATABASE_REPLICA_URL", None)
+    # commands.seed COPYs over the direct URL, which must not point anywhere else
+    os.environ.pop("DATABASE_DIRECT_URL", None)
+    # Keep users cached for the whole run so auth never adds a query mid-measurement
+    os.environ["USER_CACHE_TTL_SECONDS"] = "3600"
+
+import httpx  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+from auth.dbs import Base, Role, User, async_session_maker, engine  # noqa: E402
+from auth.users import cookie_transport, get_jwt_strategy  # noqa: E402
+from commands.seed import build_parser  # noqa: E402
+from commands.seed import seed as seed_tool  # noqa: E402
+from main import app  # noqa: E402
+from models import MaintenanceRequest, MaintenanceRequestType  # noqa: E402
+from team_cache import team_cache  # noqa: E402
+
+PERF_SEED = int(os.environ.get("PERF_SEED", "42"))
+PERF_USERS = int(os.environ.get("PERF_USERS", "200"))
+PERF_TEAMS = int(os.environ.get("PERF_TEAMS", "20"))
+PERF_EQUIPMENT = int(os.environ.get("PERF_EQUIPMENT", "5000"))
+PERF_TICKETS = int(os.environ.get("PERF_TICKETS", "50000"))
+PERF_ITERATIONS = int(os.environ.get("PERF_ITERATIONS", "30"))
+# Multiplies every latency budget, for slower machines
+PERF_LATENCY_SCALE = float(os.environ.get("PERF_LATENCY_SCALE", "1"))
+PERF_REPORT_PATH = Path(os.environ.get("PERF_REPORT_PATH", "perf-report.json"))
+
+
+@dataclass
+class SeedData:
+    admin: User
+    user: User
+    team_id: uuid.UUID
+    equipment_id: uuid.UUID
+    ticket_id: uuid.UUID
+
+
+@dataclass
+class QueryRecorder:
+    """Collects every SQL statement sent through the app's engine."""
+    statements: list[str] = field(default_factory=list)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+# endpoint label -> measured results, written to PERF_REPORT_PATH at the end
+perf_results: dict[str, dict] = {}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not perf_results:
+        return
+    report = {
+        "volumes": {
+            "users": PERF_USERS,
+            "teams": PERF_TEAMS,
+            "equipment": PERF_EQUIPMENT,
+            "tickets": PERF_TICKETS,
+        },
+        "seed": PERF_SEED,
+        "iterations": PERF_ITERATIONS,
+        "latency_scale": PERF_LATENCY_SCALE,
+        "endpoints": perf_results,
+    }
+    PERF_REPORT_PATH.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+# ============ Seeding ============
+
+async def seed_database() -> SeedData:
+    """Recreate the schema and fill it with PERF_* volumes from the commands.seed generator."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    args = build_parser().parse_args([
+        "--seed", str(PERF_SEED),
+        "--users", str(PERF_USERS),
+        "--teams", str(PERF_TEAMS),
+        "--equipment", str(PERF_EQUIPMENT),
+        "--tickets", str(PERF_TICKETS),
+        "--workers", "1",
+    ])
+    assert await seed_tool(args) == 0
+
+    async with async_session_maker() as session:
+        admin = await session.scalar(
+            select(User).where(User.role == Role.ADMIN).order_by(User.email).limit(1)
+        )
+        # The newest repair request: raised by the owner of its equipment, who is the measured user
+        ticket = await session.scalar(
+            select(MaintenanceRequest)
+            .where(MaintenanceRequest.request_type == MaintenanceRequestType.CORRECTIVE)
+            .order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id)
+            .limit(1)
+        )
+        user = await session.get(User, ticket.created_by)
+        seed_data = SeedData(
+            admin=admin,
+            user=user,
+            team_id=ticket.maintenance_team_id,
+            equipment_id=ticket.equipment_id,
+            ticket_id=ticket.id,
+        )
+
+    await team_cache.reload()
+    return seed_data
+
+
+# ============ Fixtures ============
+
+@pytest.fixture(scope="session")
+def event_loop_runner():
+    """One event loop for the whole session, so pooled connections stay usable."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def seed(event_loop_runner) -> SeedData:
+    if not PERF_DATABASE_URL:
+        pytest.skip("PERF_DATABASE_URL is not set")
+    database = make_url(PERF_DATABASE_URL).database or ""
+    if not database.endswith(("_perf", "_test")):
+        pytest.skip("PERF_DATABASE_URL must name a disposable *_perf or *_test database")
+    return event_loop_runner(seed_database())
+
+
+@pytest.fixture(scope="session")
+def clients(event_loop_runner, seed):
+    """Authenticated httpx clients for the admin and the regular user, keyed by role."""
+    strategy = get_jwt_strategy()
+    result = {}
+    for role, user in [("admin", seed.admin), ("user", seed.user)]:
+        token = event_loop_runner(strategy.write_token(user))
+        result[role] = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="https://perf.test",
+            cookies={cookie_transport.cookie_name: token},
+        )
+    yield result
+    for client in result.values():
+        event_loop_runner(client.aclose())
+
+
+@pytest.fixture
+def query_recorder():
+    recorder = QueryRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    yield recorder
+    event.remove(engine.sync_engine, "before_cursor_execute", recorder)
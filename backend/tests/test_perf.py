@@ -0,0 +1,145 @@
+"""
+Query-count and latency budgets per endpoint.
+
+Each endpoint is called once to warm caches, then PERF_ITERATIONS times. The
+test fails if any measured call runs more SQL statements than its budget (N+1
+queries, duplicate lookups) or if the p95 latency exceeds its budget. Results
+for every endpoint are written to PERF_REPORT_PATH, so runs can be diffed.
+"""
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import pytest
+from conftest import PERF_ITERATIONS, PERF_LATENCY_SCALE, SeedData, perf_results
+
+
+@dataclass
+class Budget:
+    method: str
+    url: str
+    client: str
+    max_queries: int
+    p95_ms: float
+    body: Optional[Callable[[SeedData, int], Any]] = None
+    iterations: Optional[int] = None
+    expected_status: int = 200
+    # Send If-None-Match with the ETag of a first, unconditional call
+    revalidate: bool = False
+
+    @property
+    def label(self) -> str:
+        suffix = ", If-None-Match" if self.revalidate else ""
+        return f"{self.method} {self.url} ({self.client}{suffix})"
+
+
+def _ticket(seed: SeedData, i: int) -> dict:
+    return {"subject": f"Perf ticket {i}", "equipment_id": str(seed.equipment_id)}
+
+
+def _bulk(seed: SeedData, i: int) -> list[dict]:
+    return [_ticket(seed, i * 50 + n) for n in range(50)]
+
+
+def _status_change(seed: SeedData, i: int) -> dict:
+    # Alternate so every call changes the ticket's stats key
+    return {"status": "IN_PROGRESS" if i % 2 else "NEW"}
+
+
+BUDGETS = [
+    # Reads
+    Budget("GET", "/tickets/", "admin", 1, 50),
+    Budget("GET", "/tickets/?status_filter=NEW", "admin", 1, 50),
+    Budget("GET", "/tickets/?team_id={team_id}", "admin", 1, 50),
+    Budget("GET", "/tickets/my", "user", 1, 50),
+    Budget("GET", "/tickets/?include_archived=true", "admin", 1, 50),
+    Budget("GET", "/tickets/my?include_archived=true", "user", 1, 50),
+    Budget("GET", "/tickets/{ticket_id}", "user", 1, 20),
+    Budget("GET", "/tickets/search?q=repair%2017", "admin", 1, 50),
+    Budget("GET", "/tickets/search?q=repair", "user", 1, 50),
+    Budget("GET", "/tickets/calendar?from=2025-12-01&to=2025-12-31", "admin", 1, 20),
+    Budget("GET", "/tickets/calendar?from=2025-12-01&to=2025-12-31&team_id={team_id}", "admin", 1, 10),
+    Budget("GET", "/tickets/calendar?from=2025-12-01&to=2025-12-31", "user", 1, 10),
+    Budget("GET", "/equipment/", "admin", 1, 50),
+    Budget("GET", "/equipment/my/list", "user", 1, 50),
+    Budget("GET", "/equipment/{equipment_id}", "user", 1, 20),
+    Budget("GET", "/equipment/search?q=equipment%2012", "admin", 1, 20),
+    Budget("GET", "/equipment/search?q=compu", "user", 1, 20),
+    Budget("GET", "/teams/", "admin", 0, 10),
+    Budget("GET", "/teams/{team_id}/members", "admin", 0, 10),
+    Budget("GET", "/dashboard/summary", "admin", 1, 50),
+    Budget("GET", "/dashboard/summary", "user", 1, 50),
+    Budget("GET", "/tickets/export", "admin", 1, 5000, iterations=3),
+    # Conditional reads: one aggregate or key lookup, nothing serialized
+    Budget("GET", "/tickets/", "admin", 1, 20, expected_status=304, revalidate=True),
+    Budget("GET", "/tickets/my", "user", 1, 20, expected_status=304, revalidate=True),
+    Budget("GET", "/tickets/{ticket_id}", "user", 1, 10, expected_status=304, revalidate=True),
+    Budget("GET", "/equipment/", "admin", 1, 20, expected_status=304, revalidate=True),
+    Budget("GET", "/equipment/{equipment_id}", "user", 1, 10, expected_status=304, revalidate=True),
+    # Writes
+    Budget("POST", "/tickets/", "user", 4, 30, body=_ticket, expected_status=201),
+    Budget("POST", "/tickets/bulk", "user", 4, 150, body=_bulk),
+    Budget("PUT", "/tickets/{ticket_id}", "admin", 5, 40, body=_status_change),
+]
+
+
+def p95(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(len(ordered) * 0.95) - 1, 0)]
+
+
+async def measure(client, budget: Budget, seed: SeedData, query_recorder) -> dict:
+    url = budget.url.format(
+        team_id=seed.team_id, ticket_id=seed.ticket_id, equipment_id=seed.equipment_id
+    )
+    iterations = budget.iterations or PERF_ITERATIONS
+    headers = {}
+    if budget.revalidate:
+        headers["If-None-Match"] = (await client.get(url)).headers["ETag"]
+    latencies_ms = []
+    query_counts = []
+    worst_statements: list[str] = []
+
+    for i in range(iterations + 1):
+        body = budget.body(seed, i) if budget.body else None
+        query_recorder.statements.clear()
+        start = time.perf_counter()
+        response = await client.request(budget.method, url, json=body, headers=headers)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert response.status_code == budget.expected_status, response.text
+
+        # The first call warms the user and team caches and is not measured
+        if i == 0:
+            continue
+        latencies_ms.append(elapsed_ms)
+        query_counts.append(len(query_recorder.statements))
+        if len(query_recorder.statements) > len(worst_statements):
+            worst_statements = list(query_recorder.statements)
+
+    return {
+        "iterations": iterations,
+        "queries": max(query_counts),
+        "query_budget": budget.max_queries,
+        "p50_ms": round(sorted(latencies_ms)[len(latencies_ms) // 2], 3),
+        "p95_ms": round(p95(latencies_ms), 3),
+        "max_ms": round(max(latencies_ms), 3),
+        "p95_budget_ms": budget.p95_ms * PERF_LATENCY_SCALE,
+        "statements": worst_statements,
+    }
+
+
+@pytest.mark.parametrize("budget", BUDGETS, ids=lambda budget: budget.label)
+def test_endpoint_budget(budget: Budget, seed, clients, event_loop_runner, query_recorder):
+    result = event_loop_runner(measure(clients[budget.client], budget, seed, query_recorder))
+    statements = result.pop("statements")
+    perf_results[budget.label] = result
+
+    assert result["queries"] <= budget.max_queries, (
+        f"{budget.label} ran {result['queries']} statements (budget {budget.max_queries}):\n"
+        + "\n---\n".join(statements)
+    )
+    assert result["p95_ms"] <= result["p95_budget_ms"], (
+        f"{budget.label} p95 {result['p95_ms']}ms exceeds {result['p95_budget_ms']}ms"
+    )
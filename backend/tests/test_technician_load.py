@@ -0,0 +1,118 @@
+"""
+In-memory technician load: commit-only count moves, the lazily cleaned per-team
+heap and batch assignment. No database is needed: transactions run on SQLite
+and team membership is set on the team cache directly.
+"""
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import technician_load as technician_load_module
+from models import MaintenanceRequestStatus
+from team_cache import team_cache
+from technician_load import AssignmentBatch, TechnicianLoad, load_key, move_on_commit
+
+TEAM_ID = uuid.UUID(int=1)
+TECHNICIANS = [uuid.UUID(int=100 + i) for i in range(3)]
+
+
+@pytest.fixture
+def load(monkeypatch) -> TechnicianLoad:
+    """A fresh TechnicianLoad, installed as the one commits update, over a team of TECHNICIANS."""
+    fresh = TechnicianLoad()
+    monkeypatch.setattr(technician_load_module, "technician_load", fresh)
+    monkeypatch.setattr(technician_load_module, "TICKET_ASSIGNMENT_STRATEGY", "least_loaded")
+    monkeypatch.setattr(team_cache, "members", {TEAM_ID: dict.fromkeys(TECHNICIANS, "TECHNICIAN")})
+    monkeypatch.setattr(team_cache, "revision", team_cache.revision + 1)
+    return fresh
+
+
+def open_key(user_id: uuid.UUID):
+    return load_key(TEAM_ID, user_id, MaintenanceRequestStatus.NEW)
+
+
+def expected_least_loaded(load: TechnicianLoad) -> uuid.UUID:
+    return min(TECHNICIANS, key=lambda user_id: (load.counts.get((TEAM_ID, user_id), 0), user_id))
+
+
+# ============ Commit bookkeeping ============
+
+def test_rolled_back_write_leaves_counts_unchanged(load):
+    load.counts = {open_key(TECHNICIANS[0]): 2}
+    session = Session(create_engine("sqlite://"))
+
+    session.connection()
+    move_on_commit(session, open_key(TECHNICIANS[0]), open_key(TECHNICIANS[1]))
+    session.rollback()
+    assert load.counts == {open_key(TECHNICIANS[0]): 2}
+
+    # The rolled-back move is not replayed by the next commit
+    session.connection()
+    move_on_commit(session, None, open_key(TECHNICIANS[2]))
+    session.commit()
+    assert load.counts == {open_key(TECHNICIANS[0]): 2, open_key(TECHNICIANS[2]): 1}
+
+
+def test_savepoint_rollback_keeps_the_outer_moves(load):
+    session = Session(create_engine("sqlite://"))
+
+    session.connection()
+    move_on_commit(session, None, open_key(TECHNICIANS[0]))
+    session.begin_nested().rollback()
+    session.commit()
+    assert load.counts == {open_key(TECHNICIANS[0]): 1}
+
+
+# ============ Heap ============
+
+def test_least_loaded_skips_stale_entries(load):
+    assert load.least_loaded(TEAM_ID) == TECHNICIANS[0]
+
+    # Each move leaves the technician's previous entry behind in the heap
+    moves = [
+        (None, TECHNICIANS[0]), (None, TECHNICIANS[0]), (None, TECHNICIANS[1]),
+        (None, TECHNICIANS[2]), (TECHNICIANS[0], None), (None, TECHNICIANS[2]),
+        (TECHNICIANS[1], TECHNICIANS[0]), (TECHNICIANS[2], None),
+    ]
+    for old, new in moves:
+        load.move(old and open_key(old), new and open_key(new))
+        assert load.least_loaded(TEAM_ID) == expected_least_loaded(load)
+    assert load.counts == {
+        open_key(TECHNICIANS[0]): 2, open_key(TECHNICIANS[1]): 0, open_key(TECHNICIANS[2]): 1,
+    }
+    assert load.least_loaded(TEAM_ID) == TECHNICIANS[1]
+
+
+def test_least_loaded_after_the_heap_is_compacted(load):
+    load.least_loaded(TEAM_ID)
+    moves = [(None, TECHNICIANS[n % 2]) for n in range(100)] + [(TECHNICIANS[1], None)] * 50
+    for old, new in moves:
+        load.move(old and open_key(old), new and open_key(new))
+        assert load.least_loaded(TEAM_ID) == expected_least_loaded(load)
+        assert len(load._heaps[TEAM_ID].entries) <= 4 * len(TECHNICIANS) + 16
+    assert load.least_loaded(TEAM_ID) == TECHNICIANS[1]
+
+
+# ============ Batches ============
+
+def test_batch_spreads_tickets_evenly(load):
+    batch = AssignmentBatch(load)
+    picks = Counter(batch.assign(TEAM_ID, None) for _ in range(30))
+    assert picks == dict.fromkeys(TECHNICIANS, 10)
+
+
+def test_batch_evens_out_existing_load(load):
+    load.counts = {open_key(TECHNICIANS[0]): 5, open_key(TECHNICIANS[1]): 2}
+    batch = load.batch()
+    picks = Counter(batch.assign(TEAM_ID, None) for _ in range(8))
+    assert picks == {TECHNICIANS[1]: 3, TECHNICIANS[2]: 5}
+    # The shared counts only move when the batch's transaction commits
+    assert load.counts == {open_key(TECHNICIANS[0]): 5, open_key(TECHNICIANS[1]): 2}
+
+
+def test_batch_without_technicians_uses_the_fallback(load):
+    fallback = uuid.UUID(int=999)
+    assert load.batch().assign(uuid.UUID(int=2), fallback) == fallback
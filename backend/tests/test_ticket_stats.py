@@ -0,0 +1,78 @@
+"""
+ticket_stats stays equal to a recount of the tickets under concurrent writes
+and archival, and the dashboard counts archived tickets on every path.
+
+Runs against the same PERF_DATABASE_URL database as the performance suite.
+"""
+import asyncio
+
+from archive import archive_closed_tickets
+from auth.dbs import engine
+from commands.rebuild_ticket_stats import stats_drift
+
+
+async def assert_no_drift() -> None:
+    async with engine.connect() as conn:
+        drift, _ = await stats_drift(conn)
+    assert not drift, f"ticket_stats drifted: {drift}"
+
+
+async def tickets_to_write(client, seed, count: int) -> list[str]:
+    """Ids of `count` tickets other than the one the performance suite measures."""
+    response = await client.get("/tickets/", params={"limit": count + 1})
+    assert response.status_code == 200, response.text
+    ids = [ticket["id"] for ticket in response.json() if ticket["id"] != str(seed.ticket_id)]
+    return ids[:count]
+
+
+async def concurrent_writes(client, seed) -> None:
+    changed, deleted = await tickets_to_write(client, seed, 2)
+
+    # Racing status changes of one ticket must each move its count exactly once
+    responses = await asyncio.gather(*(
+        client.put(f"/tickets/{changed}", json={"status": ticket_status})
+        for ticket_status in ["IN_PROGRESS", "REPAIRED", "NEW", "IN_PROGRESS"]
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    await assert_no_drift()
+
+    # Racing deletes of one ticket decrement it once; the losers find it gone
+    responses = await asyncio.gather(*(client.delete(f"/tickets/{deleted}") for _ in range(3)))
+    assert sorted(response.status_code for response in responses) == [204, 404, 404]
+    await assert_no_drift()
+
+
+async def dashboard_totals(clients) -> dict:
+    totals = {}
+    for role, client in clients.items():
+        response = await client.get("/dashboard/summary")
+        assert response.status_code == 200, response.text
+        summary = response.json()
+        totals[role] = (
+            summary["total_tickets"],
+            {team["team_id"]: team["count"] for team in summary["tickets_by_team"]},
+        )
+    return totals
+
+
+async def archive_and_compare(clients, seed) -> None:
+    # Close some of the user's tickets, so archival moves tickets the user path counts
+    response = await clients["user"].get("/tickets/my", params={"limit": 20})
+    assert response.status_code == 200, response.text
+    for ticket in response.json():
+        if ticket["id"] != str(seed.ticket_id) and ticket["status"] in ("NEW", "IN_PROGRESS"):
+            closed = await clients["admin"].put(f"/tickets/{ticket['id']}", json={"status": "REPAIRED"})
+            assert closed.status_code == 200, closed.text
+
+    before = await dashboard_totals(clients)
+    assert await archive_closed_tickets(after_days=0) > 0
+    assert await dashboard_totals(clients) == before
+    await assert_no_drift()
+
+
+def test_stats_match_after_concurrent_writes(seed, clients, event_loop_runner):
+    event_loop_runner(concurrent_writes(clients["admin"], seed))
+
+
+def test_dashboard_counts_archived_tickets(seed, clients, event_loop_runner):
+    event_loop_runner(archive_and_compare(clients, seed))
@@ -0,0 +1,157 @@
+"""
+Live ticket change feed, fanned out to server-sent event subscribers.
+
+Every ticket write sends NOTIFY on TICKET_FEED_CHANNEL in its transaction, so
+events are only published once the write commits. Each process holds one
+LISTEN connection, started with the first subscriber, and copies every event
+into the bounded queue of each subscriber whose filter matches. A subscriber
+that falls FEED_BUFFER_SIZE events behind loses its backlog and is sent a
+resync event instead, so one slow client never holds memory for the rest.
+"""
+import asyncio
+import json
+import os
+import uuid
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+
+from sqlalchemy import Text, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from listener import RECONNECT_DELAY_SECONDS, listen_forever
+from models import MaintenanceRequest
+from schema import MaintenanceRequestRead
+
+TICKET_FEED_CHANNEL = "ticket_feed"
+KEEPALIVE_SECONDS = 15
+# Events a subscriber may fall behind before it is told to resync
+FEED_BUFFER_SIZE = int(os.getenv("TICKET_FEED_BUFFER_SIZE", "256"))
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+TicketEvent = Literal["created", "updated", "deleted"]
+
+RESYNC_MESSAGE = "event: resync\ndata: {}\n\n"
+KEEPALIVE_MESSAGE = ": keepalive\n\n"
+
+
+# ============ Publishing ============
+
+def event_payload(
+    event: TicketEvent, ticket: MaintenanceRequest, previous_team_id: Optional[uuid.UUID] = None
+) -> str:
+    """
+    The JSON payload of one ticket event.
+
+    The ticket is sent without its description to keep payloads small; when it
+    still does not fit in a NOTIFY, only its keys are sent and clients fetch it.
+    """
+    team_ids = {str(ticket.maintenance_team_id)}
+    if previous_team_id:
+        team_ids.add(str(previous_team_id))
+    body = MaintenanceRequestRead.model_validate(ticket).model_dump(mode="json", exclude={"description"})
+    payload = json.dumps({"event": event, "team_ids": sorted(team_ids), "ticket": body})
+    if len(payload.encode()) < NOTIFY_PAYLOAD_LIMIT:
+        return payload
+    keys = {name: body[name] for name in ("id", "maintenance_team_id", "assigned_user_id", "created_by")}
+    return json.dumps({"event": event, "team_ids": sorted(team_ids), "ticket": keys, "partial": True})
+
+
+async def notify_ticket_changes(session: AsyncSession, payloads: Iterable[str]) -> None:
+    """Publish event payloads in one statement; delivered when the session commits."""
+    payloads = list(payloads)
+    if payloads:
+        await session.execute(
+            select(func.pg_notify(TICKET_FEED_CHANNEL, func.unnest(literal(payloads, ARRAY(Text)))))
+        )
+
+
+# ============ Subscribing ============
+
+@dataclass(eq=False)
+class Subscription:
+    """One connected client: its filter and its bounded queue of SSE messages."""
+    team_ids: Optional[frozenset[str]] = None
+    created_by: Optional[str] = None
+    assigned_user_id: Optional[str] = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(FEED_BUFFER_SIZE))
+
+    def wants(self, event: dict) -> bool:
+        ticket = event["ticket"]
+        if self.team_ids is not None and self.team_ids.isdisjoint(event["team_ids"]):
+            return False
+        if self.created_by is not None and ticket["created_by"] != self.created_by:
+            return False
+        return self.assigned_user_id is None or ticket["assigned_user_id"] == self.assigned_user_id
+
+    def push(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog and have the client refetch instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_MESSAGE)
+
+
+class TicketFeed:
+    """The per-process LISTEN connection and its subscribers."""
+
+    def __init__(self):
+        self.subscriptions: set[Subscription] = set()
+        self._listener_task: Optional[asyncio.Task] = None
+
+    def subscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.add(subscription)
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(
+                listen_forever(TICKET_FEED_CHANNEL, self._on_notify, self._resync)
+            )
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    async def stop(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+    def publish(self, payload: str) -> None:
+        """Fan one NOTIFY payload out to every matching subscriber."""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        # Formatted once, shared by every subscriber's queue
+        message = f"event: {event['event']}\ndata: {payload}\n\n"
+        for subscription in self.subscriptions:
+            if subscription.wants(event):
+                subscription.push(message)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self.publish(payload)
+
+    async def _resync(self) -> None:
+        """Events sent before LISTEN took effect were missed: have every client refetch."""
+        for subscription in self.subscriptions:
+            subscription.push(RESYNC_MESSAGE)
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[str]:
+        """SSE messages for one subscriber until the client disconnects."""
+        self.subscribe(subscription)
+        try:
+            yield f"retry: {RECONNECT_DELAY_SECONDS * 1000}\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield KEEPALIVE_MESSAGE
+        finally:
+            self.unsubscribe(subscription)
+
+
+ticket_feed = TicketFeed()
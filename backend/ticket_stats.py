@@ -0,0 +1,68 @@
+"""Incremental maintenance of the ticket_stats rollup."""
+import uuid
+from collections import Counter
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from archive import all_tickets
+from models import MaintenanceRequest, MaintenanceRequestStatus, TicketStat
+
+StatKey = tuple[uuid.UUID, str, MaintenanceRequestStatus, date]
+
+
+def stat_key(ticket: MaintenanceRequest, category: str) -> StatKey:
+    """The ticket_stats row a ticket is counted in. The ticket must be flushed."""
+    return (ticket.maintenance_team_id, category, ticket.status, ticket.created_at.date())
+
+
+async def record_ticket_stats(session: AsyncSession, deltas: Counter) -> None:
+    """
+    Add per-key count deltas to ticket_stats in the caller's transaction.
+    Keys are written in sorted order so concurrent writers lock rows consistently.
+    """
+    rows = [
+        {
+            "maintenance_team_id": team_id,
+            "equipment_category": category,
+            "status": ticket_status,
+            "day": day,
+            "ticket_count": delta,
+        }
+        for (team_id, category, ticket_status, day), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    
+    stmt = pg_insert(TicketStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            TicketStat.maintenance_team_id,
+            TicketStat.equipment_category,
+            TicketStat.status,
+            TicketStat.day,
+        ],
+        set_={"ticket_count": TicketStat.ticket_count + stmt.excluded.ticket_count},
+    )
+    await session.execute(stmt)
+
+
+async def move_equipment_category(
+    session: AsyncSession, equipment_id: uuid.UUID, old_category: str, new_category: str
+) -> None:
+    """Re-key the counts of one equipment's tickets, archived ones included, after its category changes."""
+    tickets = all_tickets("maintenance_team_id", "status", "created_at", "equipment_id")
+    day = func.date(tickets.c.created_at)
+    result = await session.execute(
+        select(tickets.c.maintenance_team_id, tickets.c.status, day, func.count())
+        .where(tickets.c.equipment_id == equipment_id)
+        .group_by(tickets.c.maintenance_team_id, tickets.c.status, day)
+    )
+    deltas = Counter()
+    for team_id, ticket_status, day, count in result.all():
+        deltas[(team_id, old_category, ticket_status, day)] -= count
+        deltas[(team_id, new_category, ticket_status, day)] += count
+    await record_ticket_stats(session, deltas)
@@ -1,12 +1,11 @@
 "use client";
 import { useAuth } from "@/components/auth/AuthContext";
 import {
+  getDashboardSummary,
   getEquipment,
   getMyEquipment,
-  getMyTickets,
-  getTickets,
+  DashboardSummary,
   Equipment,
-  Ticket,
 } from "@/lib/api";
 import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
@@ -14,7 +13,7 @@ import { useRouter } from "next/navigation";
 export default function DashboardPage() {
   const { user, loading, isAdmin, logoutAction } = useAuth();
   const router = useRouter();
-  const [tickets, setTickets] = useState<Ticket[]>([]);
+  const [summary, setSummary] = useState<DashboardSummary | null>(null);
   const [equipment, setEquipment] = useState<Equipment[]>([]);
   const [error, setError] = useState<string | null>(null);
 
@@ -29,12 +28,12 @@ export default function DashboardPage() {
 
     async function fetchData() {
       try {
-        // Admin sees all, users see their own
-        const ticketData = isAdmin ? await getTickets() : await getMyTickets();
-        const equipmentData = isAdmin
-          ? await getEquipment()
-          : await getMyEquipment();
-        setTickets(ticketData);
+        // Admin sees all, users see their own (the summary is scoped server-side)
+        const [summaryData, equipmentData] = await Promise.all([
+          getDashboardSummary(),
+          isAdmin ? getEquipment() : getMyEquipment(),
+        ]);
+        setSummary(summaryData);
         setEquipment(equipmentData);
       } catch (err) {
         console.error("Fetch error:", err);
@@ -54,6 +53,8 @@ export default function DashboardPage() {
 
   if (!user) return null;
 
+  const tickets = summary?.recent_tickets ?? [];
+
   return (
     <div className="min-h-screen bg-gray-50 dark:bg-gray-900">
       {/* Header */}
@@ -139,7 +140,9 @@ export default function DashboardPage() {
               Total Equipment
             </p>
             <p className="text-3xl font-bold text-gray-900 dark:text-white">
-              {equipment.length}
+              {summary
+                ? summary.open_equipment + summary.scrapped_equipment
+                : 0}
             </p>
           </div>
           <div className="bg-white dark:bg-gray-800 p-6 rounded-xl shadow">
@@ -147,7 +150,7 @@ export default function DashboardPage() {
               Open Tickets
             </p>
             <p className="text-3xl font-bold text-yellow-500">
-              {tickets.filter((t) => t.status === "NEW").length}
+              {summary?.tickets_by_status.NEW ?? 0}
             </p>
           </div>
           <div className="bg-white dark:bg-gray-800 p-6 rounded-xl shadow">
@@ -155,13 +158,13 @@ export default function DashboardPage() {
               In Progress
             </p>
             <p className="text-3xl font-bold text-blue-500">
-              {tickets.filter((t) => t.status === "IN_PROGRESS").length}
+              {summary?.tickets_by_status.IN_PROGRESS ?? 0}
             </p>
           </div>
           <div className="bg-white dark:bg-gray-800 p-6 rounded-xl shadow">
             <p className="text-gray-500 dark:text-gray-400 text-sm">Resolved</p>
             <p className="text-3xl font-bold text-green-500">
-              {tickets.filter((t) => t.status === "REPAIRED").length}
+              {summary?.tickets_by_status.REPAIRED ?? 0}
             </p>
           </div>
         </div>
@@ -239,7 +242,7 @@ export default function DashboardPage() {
         <section className="bg-white dark:bg-gray-800 rounded-xl shadow">
           <div className="p-6 border-b border-gray-200 dark:border-gray-700">
             <h2 className="text-xl font-semibold text-gray-900 dark:text-white">
-              {isAdmin ? "All Tickets" : "My Tickets"}
+              {isAdmin ? "Recent Tickets" : "My Recent Tickets"}
             </h2>
           </div>
           <div className="overflow-x-auto">
@@ -305,4 +305,29 @@ export async function updateTicket(id: string, data: TicketAdminUpdate): Promise
         throw new Error(err.detail || "Failed to update ticket");
     }
     return response.json();
-}
\ No newline at end of file
+}
+
+// ============ DASHBOARD API ============
+
+export interface TeamTicketCount {
+    team_id: string;
+    team_name?: string;
+    count: number;
+}
+
+export interface DashboardSummary {
+    total_tickets: number;
+    tickets_by_status: Record<Ticket["status"], number>;
+    tickets_by_team: TeamTicketCount[];
+    open_equipment: number;
+    scrapped_equipment: number;
+    recent_tickets: Ticket[];
+}
+
+export async function getDashboardSummary(recent = 10): Promise<DashboardSummary> {
+    const response = await fetch(`${API_URL}/dashboard/summary?recent=${recent}`, {
+        credentials: "include",
+    });
+    if (!response.ok) throw new Error("Failed to fetch dashboard summary");
+    return response.json();
+}